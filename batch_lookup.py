@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Netflix SQL Project - Batch Name Lookup
+Resolves many actors, directors, countries or genres in one set-based join
+instead of one LIKE scan per name
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from sql_functions import connect
+
+LOOKUP_FIELDS = ("casts", "director", "country", "listed_in")
+
+
+def _filter_clause(type_=None, year_range=None, country=None):
+    """WHERE clause and parameters for the optional type / year range / country filter"""
+    conditions = []
+    params = []
+    if type_:
+        conditions.append("type = ?")
+        params.append(type_)
+    if year_range:
+        conditions.append("release_year BETWEEN ? AND ?")
+        params.extend(year_range)
+    if country:
+        conditions.append("country LIKE ?")
+        params.append(f"%{country}%")
+    return (" AND ".join(conditions) or "1"), params
+
+
+def batch_lookup(conn, names, field="casts", type_=None, year_range=None, country=None):
+    """Resolve every name in one pass over netflix
+
+    The names go into a temp table; the field is split once per matching
+    row and joined against it. Matching is on whole comma-separated names,
+    case-insensitively. Returns {input name: [(show_id, title, type, release_year), ...]}.
+    """
+    if field not in LOOKUP_FIELDS:
+        raise ValueError(f"Unsupported lookup field: {field}")
+
+    cursor = conn.cursor()
+    cursor.execute("DROP TABLE IF EXISTS temp.lookup_names")
+    cursor.execute("CREATE TEMP TABLE lookup_names (name TEXT PRIMARY KEY COLLATE NOCASE) WITHOUT ROWID")
+    cursor.executemany("INSERT OR IGNORE INTO temp.lookup_names (name) VALUES (?)",
+                       ((name.strip(),) for name in names))
+
+    where, params = _filter_clause(type_, year_range, country)
+    cursor.execute(f"""
+    WITH RECURSIVE split(show_id, title, type, release_year, name, rest) AS (
+        SELECT show_id, title, type, release_year, '', {field} || ','
+        FROM netflix
+        WHERE {field} IS NOT NULL AND {field} != '' AND {where}
+        UNION ALL
+        SELECT show_id, title, type, release_year,
+               TRIM(SUBSTR(rest, 1, INSTR(rest, ',') - 1)),
+               SUBSTR(rest, INSTR(rest, ',') + 1)
+        FROM split
+        WHERE rest != ''
+    )
+    SELECT l.name, s.show_id, s.title, s.type, s.release_year
+    FROM split AS s
+    JOIN temp.lookup_names AS l ON l.name = s.name
+    ORDER BY l.name, s.release_year DESC, s.show_id
+    """, params)
+
+    grouped = {}
+    for name, show_id, title, type_value, release_year in cursor:
+        grouped.setdefault(name.lower(), []).append((show_id, title, type_value, release_year))
+    cursor.execute("DROP TABLE IF EXISTS temp.lookup_names")
+
+    return {name: grouped.get(name.strip().lower(), []) for name in names}
+
+
+def sample_names(conn, field="casts", limit=1000):
+    """Distinct names from a field, for demos and benchmarks"""
+    names = []
+    seen = set()
+    for (value,) in conn.execute(f"SELECT {field} FROM netflix WHERE {field} != ''"):
+        for name in value.split(','):
+            name = name.strip()
+            if name and name not in seen:
+                seen.add(name)
+                names.append(name)
+                if len(names) >= limit:
+                    return names
+    return names
+
+
+def main():
+    script_dir = Path(__file__).parent
+    db_path = script_dir / "netflix.db"
+
+    if not db_path.exists():
+        print(f"✗ Database not found: {db_path}")
+        print("Please run: python setup_sqlite.py")
+        sys.exit(1)
+
+    conn = connect(str(db_path))
+    args = sys.argv[1:]
+    field = args[args.index("--field") + 1] if "--field" in args else "casts"
+    names = [arg for i, arg in enumerate(args)
+             if not arg.startswith("--") and (i == 0 or args[i - 1] != "--field")]
+    if not names:
+        names = sample_names(conn, field)
+
+    print("\n" + "="*60)
+    print("Netflix SQL Project - Batch Name Lookup")
+    print("="*60 + "\n")
+
+    start = time.perf_counter()
+    results = batch_lookup(conn, names, field)
+    elapsed = time.perf_counter() - start
+    found = sum(1 for matches in results.values() if matches)
+    print(f"✓ Resolved {len(names)} names ({found} found) in {elapsed * 1000:.1f} ms "
+          f"— {len(names) / elapsed:,.0f} names/s")
+
+    if "--compare" in args:
+        start = time.perf_counter()
+        for name in names:
+            conn.execute(f"SELECT show_id FROM netflix WHERE {field} LIKE ?", (f"%{name}%",)).fetchall()
+        elapsed = time.perf_counter() - start
+        print(f"  One LIKE scan per name: {elapsed * 1000:.1f} ms — {len(names) / elapsed:,.0f} names/s")
+
+    print()
+    for name in names[:10]:
+        matches = results[name]
+        titles = ", ".join(title for _, title, _, _ in matches[:3])
+        print(f"  {name[:30]:<30} {len(matches):>4}  {titles[:60]}")
+    print()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Netflix SQL Project - Bitmap Index
+One bitset per distinct type, rating, genre, country and release year, so
+multi-attribute filters are evaluated with whole-bitmap AND/OR/NOT and
+counted by popcount instead of chained LIKE scans
+"""
+
+import re
+import sys
+import time
+import zlib
+from pathlib import Path
+
+from shared_scan import split_multi
+from sql_functions import connect
+
+BITMAP_TABLE = "bitmap_index"
+POSITION_TABLE = "bitmap_positions"
+
+# facet -> (column, multi-valued)
+FACETS = {
+    "type": ("type", False),
+    "rating": ("rating", False),
+    "genre": ("listed_in", True),
+    "country": ("country", True),
+    "year": ("release_year", False),
+}
+
+_TOKEN_RE = re.compile(r'\s*(?:(\()|(\))|(>=|<=|!=|=|>|<)|"([^"]*)"|([^\s()=<>!"]+))')
+
+
+class BitmapIndex:
+    """Bitmaps over title positions; bit i of a bitmap is set when title i matches
+
+    Bitmaps are Python ints, so &, | and ^ run over whole machine words
+    and int.bit_count() is the popcount. They are stored zlib-compressed.
+    """
+
+    def __init__(self, show_ids, bitmaps):
+        self.show_ids = show_ids
+        self.bitmaps = bitmaps
+        self.all = (1 << len(show_ids)) - 1
+        self._lookup = {facet: {str(value).lower(): value for value in values}
+                        for facet, values in bitmaps.items()}
+
+    @classmethod
+    def from_connection(cls, conn, table="netflix"):
+        columns = ", ".join(column for column, _ in FACETS.values())
+        rows = conn.execute(f"SELECT show_id, {columns} FROM {table}").fetchall()
+        show_ids = [row[0] for row in rows]
+
+        positions = {facet: {} for facet in FACETS}
+        for position, row in enumerate(rows):
+            for (facet, (_, multi)), value in zip(FACETS.items(), row[1:]):
+                values = split_multi(value) if multi else ([] if value in (None, "") else [value])
+                for value in values:
+                    positions[facet].setdefault(value, []).append(position)
+
+        size = (len(rows) + 7) // 8
+        bitmaps = {}
+        for facet, by_value in positions.items():
+            bitmaps[facet] = {}
+            for value, members in by_value.items():
+                bits = bytearray(size)
+                for position in members:
+                    bits[position >> 3] |= 1 << (position & 7)
+                bitmaps[facet][value] = int.from_bytes(bits, 'little')
+        return cls(show_ids, bitmaps)
+
+    def save(self, conn):
+        """Persist the bitmaps (zlib-compressed) and the position -> show_id mapping"""
+        cursor = conn.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {BITMAP_TABLE}")
+        cursor.execute(f"DROP TABLE IF EXISTS {POSITION_TABLE}")
+        cursor.execute(f"""
+        CREATE TABLE {BITMAP_TABLE} (
+            facet TEXT,
+            value TEXT,
+            bitmap BLOB,
+            PRIMARY KEY (facet, value)
+        ) WITHOUT ROWID
+        """)
+        cursor.execute(f"CREATE TABLE {POSITION_TABLE} (position INTEGER PRIMARY KEY, show_id TEXT)")
+        size = (len(self.show_ids) + 7) // 8
+        cursor.executemany(
+            f"INSERT INTO {BITMAP_TABLE} VALUES (?, ?, ?)",
+            ((facet, str(value), zlib.compress(bitmap.to_bytes(size, 'little')))
+             for facet, values in self.bitmaps.items() for value, bitmap in values.items()))
+        cursor.executemany(f"INSERT INTO {POSITION_TABLE} VALUES (?, ?)", enumerate(self.show_ids))
+        conn.commit()
+        return sum(len(values) for values in self.bitmaps.values())
+
+    @classmethod
+    def load(cls, conn):
+        """Load a persisted index, or None if BITMAP_TABLE does not exist"""
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE name = ?", (BITMAP_TABLE,))
+        if cursor.fetchone() is None:
+            return None
+        show_ids = [row[0] for row in cursor.execute(f"SELECT show_id FROM {POSITION_TABLE} ORDER BY position")]
+        bitmaps = {facet: {} for facet in FACETS}
+        for facet, value, blob in cursor.execute(f"SELECT facet, value, bitmap FROM {BITMAP_TABLE}"):
+            bitmaps[facet][int(value) if facet == "year" else value] = int.from_bytes(
+                zlib.decompress(blob), 'little')
+        return cls(show_ids, bitmaps)
+
+    def value(self, facet, value):
+        """Bitmap of one facet value (matched case-insensitively; 0 if unknown)"""
+        values = self.bitmaps[facet]
+        key = self._lookup[facet].get(str(value).strip().lower())
+        return values[key] if key is not None else 0
+
+    def any_of(self, facet, values):
+        bitmap = 0
+        for value in values:
+            bitmap |= self.value(facet, value)
+        return bitmap
+
+    def year_range(self, low=None, high=None):
+        """Titles released in [low, high]; either bound may be open"""
+        bitmap = 0
+        for year, bits in self.bitmaps["year"].items():
+            if (low is None or year >= low) and (high is None or year <= high):
+                bitmap |= bits
+        return bitmap
+
+    def negate(self, bitmap):
+        return self.all ^ bitmap
+
+    def evaluate(self, expression):
+        """Bitmap of a filter such as
+        `rating = TV-MA AND genre = Dramas AND (country = India OR country = "United Kingdom") AND year > 2015`
+
+        Conditions are `facet = value`, `facet != value` or year comparisons
+        (<, <=, >, >=), combined with AND, OR, NOT and parentheses.
+        """
+        tokens = _tokenize(expression)
+        bitmap, position = self._parse_or(tokens, 0)
+        if position != len(tokens):
+            raise ValueError(f"Unexpected '{tokens[position][1]}' in filter")
+        return bitmap
+
+    def _parse_or(self, tokens, position):
+        bitmap, position = self._parse_and(tokens, position)
+        while _is_word(tokens, position, "OR"):
+            right, position = self._parse_and(tokens, position + 1)
+            bitmap |= right
+        return bitmap, position
+
+    def _parse_and(self, tokens, position):
+        bitmap, position = self._parse_not(tokens, position)
+        while _is_word(tokens, position, "AND"):
+            right, position = self._parse_not(tokens, position + 1)
+            bitmap &= right
+        return bitmap, position
+
+    def _parse_not(self, tokens, position):
+        if _is_word(tokens, position, "NOT"):
+            bitmap, position = self._parse_not(tokens, position + 1)
+            return self.negate(bitmap), position
+        if position < len(tokens) and tokens[position][0] == "(":
+            bitmap, position = self._parse_or(tokens, position + 1)
+            if position >= len(tokens) or tokens[position][0] != ")":
+                raise ValueError("Missing ')' in filter")
+            return bitmap, position + 1
+        return self._parse_condition(tokens, position)
+
+    def _parse_condition(self, tokens, position):
+        if position + 3 > len(tokens):
+            raise ValueError("Incomplete condition in filter")
+        (facet_kind, facet), (kind, operator), (value_kind, value) = tokens[position:position + 3]
+        facet = facet.lower()
+        if facet_kind != "word" or facet not in FACETS:
+            raise ValueError(f"Unknown facet '{facet}' (use {', '.join(FACETS)})")
+        if kind != "op" or value_kind != "word":
+            raise ValueError(f"Expected '{facet} <operator> <value>'")
+
+        if operator in ("=", "!="):
+            bitmap = self.value(facet, int(value) if facet == "year" and value.isdigit() else value)
+            return (self.negate(bitmap) if operator == "!=" else bitmap), position + 3
+        if facet != "year" or not value.isdigit():
+            raise ValueError(f"'{operator}' needs year and a number")
+        year = int(value)
+        low, high = {">": (year + 1, None), ">=": (year, None),
+                     "<": (None, year - 1), "<=": (None, year)}[operator]
+        return self.year_range(low, high), position + 3
+
+    def count(self, bitmap):
+        return bitmap.bit_count()
+
+    def positions(self, bitmap, limit=None):
+        """Set bit positions in ascending order, scanning the bitmap a byte at a time"""
+        data = bitmap.to_bytes((len(self.show_ids) + 7) // 8, 'little')
+        found = 0
+        for offset, byte in enumerate(data):
+            while byte:
+                low = byte & -byte
+                yield (offset << 3) + low.bit_length() - 1
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+                byte ^= low
+
+    def show_ids_for(self, bitmap, limit=None):
+        return [self.show_ids[position] for position in self.positions(bitmap, limit)]
+
+    def facet_counts(self, bitmap, limit=None):
+        """{facet: [(value, matching titles)]} for every value, most frequent first"""
+        counts = {}
+        for facet, values in self.bitmaps.items():
+            pairs = [(value, (bitmap & bits).bit_count()) for value, bits in values.items()]
+            pairs = [pair for pair in pairs if pair[1]]
+            pairs.sort(key=lambda pair: (-pair[1], str(pair[0])))
+            counts[facet] = pairs[:limit] if limit else pairs
+        return counts
+
+
+def _tokenize(expression):
+    """[(kind, text)] with kinds '(', ')', 'op' and 'word'"""
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN_RE.match(expression, position)
+        if not match or match.end() == position:
+            raise ValueError(f"Cannot parse filter at: {expression[position:]}")
+        opening, closing, operator, quoted, word = match.groups()
+        if opening:
+            tokens.append(("(", opening))
+        elif closing:
+            tokens.append((")", closing))
+        elif operator:
+            tokens.append(("op", operator))
+        else:
+            tokens.append(("word", quoted if quoted is not None else word))
+        position = match.end()
+    return tokens
+
+
+def _is_word(tokens, position, word):
+    return position < len(tokens) and tokens[position][0] == "word" and tokens[position][1].upper() == word
+
+
+def print_facets(counts, width=5):
+    for facet, pairs in counts.items():
+        shown = ", ".join(f"{value} ({count})" for value, count in pairs[:width])
+        print(f"  {facet:<8} {shown}")
+
+
+def main():
+    script_dir = Path(__file__).parent
+    db_path = script_dir / "netflix.db"
+
+    if not db_path.exists():
+        print(f"✗ Database not found: {db_path}")
+        print("Please run: python setup_sqlite.py")
+        sys.exit(1)
+
+    args = sys.argv[1:]
+    rebuild = "--build" in args
+    args = [arg for arg in args if arg != "--build"]
+
+    conn = connect(str(db_path))
+    start = time.perf_counter()
+    index = None if rebuild else BitmapIndex.load(conn)
+    if index is None:
+        index = BitmapIndex.from_connection(conn)
+        bitmaps = index.save(conn)
+        print(f"✓ {bitmaps} bitmaps over {len(index.show_ids)} titles saved to '{BITMAP_TABLE}' "
+              f"({time.perf_counter() - start:.2f}s)")
+    else:
+        print(f"✓ Loaded '{BITMAP_TABLE}' over {len(index.show_ids)} titles "
+              f"({time.perf_counter() - start:.2f}s)")
+
+    expression = " ".join(args) or (
+        'rating = TV-MA AND genre = Dramas AND (country = India OR country = "United Kingdom") '
+        'AND year > 2015')
+    start = time.perf_counter()
+    try:
+        bitmap = index.evaluate(expression)
+    except ValueError as e:
+        print(f"✗ {e}")
+        conn.close()
+        sys.exit(1)
+    counts = index.facet_counts(bitmap)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    # Same filter as chained LIKE scans; the ', ' padding matches whole list entries only
+    sql = """
+    SELECT COUNT(*) FROM netflix
+    WHERE rating = 'TV-MA' AND ', ' || listed_in || ',' LIKE '%, Dramas,%'
+      AND (', ' || country || ',' LIKE '%, India,%' OR ', ' || country || ',' LIKE '%, United Kingdom,%')
+      AND release_year > 2015
+    """
+    sql_start = time.perf_counter()
+    sql_count = conn.execute(sql).fetchone()[0]
+    sql_elapsed = (time.perf_counter() - sql_start) * 1000
+    conn.close()
+
+    print(f"\n{expression}")
+    print(f"✓ {index.count(bitmap)} titles, with counts for every facet, in {elapsed:.2f} ms")
+    if not args:
+        print(f"✓ Chained LIKE scan: {sql_count} titles in {sql_elapsed:.2f} ms")
+    print(f"  show_ids: {', '.join(index.show_ids_for(bitmap, 10))}")
+    print_facets(counts)
+
+
+if __name__ == "__main__":
+    main()
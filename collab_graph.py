@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Netflix SQL Project - Co-appearance Graph
+Actors and directors who worked on the same title, stored as a weighted
+CSR adjacency that can be memory-mapped for neighbour, co-appearance and
+shortest-path queries
+"""
+
+import json
+import mmap
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections import deque
+from pathlib import Path
+
+from shared_scan import split_multi
+from sql_functions import connect
+
+META_NAME = "meta.json"
+NAMES_NAME = "names.txt"
+# file name -> array typecode of the persisted CSR arrays
+ARRAY_FILES = {"indptr.bin": "q", "indices.bin": "i", "weights.bin": "i"}
+
+
+def build_csr(conn, table="netflix"):
+    """Build (names, indptr, indices, weights) from the casts and director columns
+
+    Everyone credited on a title (cast or director) is linked to everyone
+    else on it; the weight is the number of shared titles. Each adjacency
+    list is sorted by node id.
+    """
+    ids = {}
+    names = []
+    edges = {}
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT director, casts FROM {table}")
+    for director, casts in cursor:
+        people = []
+        for name in split_multi(director) + split_multi(casts):
+            node = ids.get(name)
+            if node is None:
+                node = ids[name] = len(names)
+                names.append(name)
+            people.append(node)
+        people = sorted(set(people))
+        for i, u in enumerate(people):
+            for v in people[i + 1:]:
+                edges[(u, v)] = edges.get((u, v), 0) + 1
+
+    adjacency = [[] for _ in names]
+    for (u, v), weight in edges.items():
+        adjacency[u].append((v, weight))
+        adjacency[v].append((u, weight))
+
+    indptr = array('q', [0])
+    indices = array('i')
+    weights = array('i')
+    for neighbors in adjacency:
+        neighbors.sort()
+        indices.extend(v for v, _ in neighbors)
+        weights.extend(w for _, w in neighbors)
+        indptr.append(len(indices))
+    return names, indptr, indices, weights
+
+
+def save_graph(graph_dir, names, indptr, indices, weights):
+    """Write the CSR arrays as raw binary files plus a names list and metadata"""
+    graph_dir = Path(graph_dir)
+    graph_dir.mkdir(parents=True, exist_ok=True)
+    for (file_name, _), values in zip(ARRAY_FILES.items(), (indptr, indices, weights)):
+        with open(graph_dir / file_name, 'wb') as f:
+            values.tofile(f)
+    (graph_dir / NAMES_NAME).write_text("\n".join(names) + "\n", encoding='utf-8')
+    meta = {"nodes": len(names), "edges": len(indices) // 2, "byteorder": sys.byteorder,
+            "arrays": ARRAY_FILES}
+    with open(graph_dir / META_NAME, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+
+class CollabGraph:
+    """Read-only co-appearance graph over memory-mapped CSR arrays"""
+
+    def __init__(self, names, indptr, indices, weights, _maps=()):
+        self.names = names
+        self.ids = {name: node for node, name in enumerate(names)}
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self._maps = _maps
+
+    @classmethod
+    def load(cls, graph_dir):
+        """Memory-map a graph written by save_graph"""
+        graph_dir = Path(graph_dir)
+        with open(graph_dir / META_NAME, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta["byteorder"] != sys.byteorder:
+            raise ValueError(f"Graph was written on a {meta['byteorder']}-endian machine")
+
+        maps = []
+        views = []
+        for file_name, typecode in meta["arrays"].items():
+            with open(graph_dir / file_name, 'rb') as f:
+                if f.seek(0, 2) == 0:
+                    views.append(array(typecode))
+                    continue
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            maps.append(mapped)
+            views.append(memoryview(mapped).cast(typecode))
+
+        names = (graph_dir / NAMES_NAME).read_text(encoding='utf-8').split("\n")[:meta["nodes"]]
+        return cls(names, *views, _maps=maps)
+
+    @classmethod
+    def from_connection(cls, conn, table="netflix"):
+        """Build an in-memory graph directly from the database"""
+        return cls(*build_csr(conn, table))
+
+    def close(self):
+        for view in (self.indptr, self.indices, self.weights):
+            if isinstance(view, memoryview):
+                view.release()
+        for mapped in self._maps:
+            mapped.close()
+        self._maps = ()
+
+    def node(self, name):
+        node = self.ids.get(name)
+        if node is None:
+            raise KeyError(f"Unknown actor or director: {name}")
+        return node
+
+    def _adjacent(self, node):
+        return self.indptr[node], self.indptr[node + 1]
+
+    def neighbors(self, name, limit=None):
+        """[(name, shared titles)] of everyone who worked with name, most frequent first"""
+        start, end = self._adjacent(self.node(name))
+        pairs = [(self.names[self.indices[i]], self.weights[i]) for i in range(start, end)]
+        pairs.sort(key=lambda pair: (-pair[1], pair[0]))
+        return pairs[:limit] if limit else pairs
+
+    def co_appearances(self, a, b):
+        """Number of titles a and b worked on together (binary search in a's adjacency)"""
+        start, end = self._adjacent(self.node(a))
+        target = self.node(b)
+        i = bisect_left(self.indices, target, start, end)
+        if i < end and self.indices[i] == target:
+            return self.weights[i]
+        return 0
+
+    def shortest_path(self, a, b):
+        """Fewest-hop chain of collaborators from a to b (bidirectional BFS), or None"""
+        source, target = self.node(a), self.node(b)
+        if source == target:
+            return [a]
+
+        parents = [{source: None}, {target: None}]
+        frontiers = [deque([source]), deque([target])]
+        while frontiers[0] and frontiers[1]:
+            # Expand the smaller frontier one full level
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            seen, other = parents[side], parents[1 - side]
+            for _ in range(len(frontiers[side])):
+                node = frontiers[side].popleft()
+                start, end = self._adjacent(node)
+                for i in range(start, end):
+                    neighbor = self.indices[i]
+                    if neighbor in seen:
+                        continue
+                    seen[neighbor] = node
+                    if neighbor in other:
+                        return self._join_paths(parents, neighbor)
+                    frontiers[side].append(neighbor)
+        return None
+
+    def _join_paths(self, parents, meeting):
+        path = []
+        node = meeting
+        while node is not None:
+            path.append(node)
+            node = parents[0][node]
+        path.reverse()
+        node = parents[1][meeting]
+        while node is not None:
+            path.append(node)
+            node = parents[1][node]
+        return [self.names[node] for node in path]
+
+    def __len__(self):
+        return len(self.names)
+
+
+def main():
+    script_dir = Path(__file__).parent
+    db_path = script_dir / "netflix.db"
+    graph_dir = script_dir / "graph"
+
+    args = sys.argv[1:]
+    command = args[0] if args else "build"
+
+    if command == "build":
+        if not db_path.exists():
+            print(f"✗ Database not found: {db_path}")
+            print("Please run: python setup_sqlite.py")
+            sys.exit(1)
+        start = time.perf_counter()
+        conn = connect(str(db_path))
+        names, indptr, indices, weights = build_csr(conn)
+        conn.close()
+        save_graph(graph_dir, names, indptr, indices, weights)
+        print(f"✓ Graph with {len(names)} people and {len(indices) // 2} edges "
+              f"written to {graph_dir} ({time.perf_counter() - start:.2f}s)")
+        return
+
+    if not (graph_dir / META_NAME).exists():
+        print(f"✗ Graph not found: {graph_dir}")
+        print("Please run: python collab_graph.py build")
+        sys.exit(1)
+
+    graph = CollabGraph.load(graph_dir)
+    try:
+        start = time.perf_counter()
+        if command == "neighbors" and len(args) >= 2:
+            result = graph.neighbors(args[1], limit=20)
+            for name, weight in result:
+                print(f"  {weight:>3}  {name}")
+        elif command == "pair" and len(args) >= 3:
+            print(f"  {graph.co_appearances(args[1], args[2])} shared titles")
+        elif command == "path" and len(args) >= 3:
+            path = graph.shortest_path(args[1], args[2])
+            print("  " + (" -> ".join(path) if path else "No connection"))
+        else:
+            print("Usage: python collab_graph.py [build | neighbors NAME | pair A B | path A B]")
+            sys.exit(1)
+        print(f"\n({(time.perf_counter() - start) * 1000:.2f} ms)")
+    except KeyError as e:
+        print(f"✗ {e.args[0]}")
+    finally:
+        graph.close()
+
+
+if __name__ == "__main__":
+    main()
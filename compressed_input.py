@@ -0,0 +1,124 @@
+"""
+Netflix SQL Project - Compressed Catalog Input
+Opens plain, gzip, bz2 or xz catalog dumps (from a path or stdin) as a
+streaming text file for the CSV parser, counting compressed and
+uncompressed bytes on the way
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import sys
+import time
+from contextlib import contextmanager
+
+READ_BUFFER_SIZE = 1 << 20
+
+# Leading magic bytes of each supported compression format
+MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+)
+
+DECOMPRESSORS = {
+    "gzip": lambda f: gzip.GzipFile(fileobj=f, mode='rb'),
+    "bz2": lambda f: bz2.BZ2File(f, mode='rb'),
+    "xz": lambda f: lzma.LZMAFile(f, mode='rb'),
+}
+
+
+class _CountingReader(io.RawIOBase):
+    """Raw binary stream that counts the bytes read through it"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.stream.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        self.bytes_read += n
+        return n
+
+
+class InputStats:
+    """Byte counts and timing for one opened catalog"""
+
+    def __init__(self, source, compression):
+        self.source = source
+        self.compression = compression
+        self.started = time.perf_counter()
+        self.finished = None
+        self._compressed = None
+        self._uncompressed = None
+
+    @property
+    def compressed_bytes(self):
+        return self._compressed.bytes_read
+
+    @property
+    def uncompressed_bytes(self):
+        return self._uncompressed.bytes_read
+
+    def finish(self):
+        """Stop the clock once the input has been consumed"""
+        self.finished = time.perf_counter()
+
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def summary(self):
+        seconds = self.elapsed() or 1e-9
+        compressed_mb = self.compressed_bytes / 1e6
+        uncompressed_mb = self.uncompressed_bytes / 1e6
+        return (f"{self.compression}: {compressed_mb:.2f} MB read ({compressed_mb / seconds:.1f} MB/s), "
+                f"{uncompressed_mb:.2f} MB decompressed ({uncompressed_mb / seconds:.1f} MB/s)")
+
+
+def detect_compression(header):
+    """'gzip', 'bz2', 'xz' or 'plain' from the first bytes of a file"""
+    for magic, name in MAGIC:
+        if header.startswith(magic):
+            return name
+    return "plain"
+
+
+@contextmanager
+def open_catalog(source, buffer_size=READ_BUFFER_SIZE):
+    """Open a catalog dump for csv.reader; yields (text stream, InputStats)
+
+    source is a path or '-' for stdin. Compression is detected from the
+    magic bytes, not the file name, and decompression is streamed.
+    """
+    if str(source) == "-":
+        raw = sys.stdin.buffer
+        owned = None
+    else:
+        raw = owned = open(source, 'rb')
+
+    try:
+        compressed = _CountingReader(raw)
+        buffered = io.BufferedReader(compressed, buffer_size)
+        compression = detect_compression(buffered.peek(8)[:8])
+
+        stats = InputStats(str(source), compression)
+        stats._compressed = compressed
+        if compression == "plain":
+            stream = buffered
+        else:
+            stream = DECOMPRESSORS[compression](buffered)
+        uncompressed = _CountingReader(stream)
+        stats._uncompressed = uncompressed
+
+        text = io.TextIOWrapper(io.BufferedReader(uncompressed, buffer_size),
+                                encoding='utf-8', newline='')
+        yield text, stats
+    finally:
+        if owned is not None:
+            owned.close()
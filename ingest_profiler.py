@@ -0,0 +1,127 @@
+"""
+Netflix SQL Project - Ingest Stage Profiler
+Records wall time, CPU time, rows processed, tracemalloc peak and RSS for
+each setup stage and writes them as a JSON report
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def current_rss():
+    """Resident set size of this process in bytes (None if unknown)"""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        # ru_maxrss is the peak, in kilobytes on Linux and bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    return None
+
+
+class StageRecord:
+    """Measurements for one stage; set .rows inside the stage to record throughput"""
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = None
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.tracemalloc_peak_bytes = 0
+        self.rss_before_bytes = None
+        self.rss_after_bytes = None
+
+    def as_dict(self):
+        record = dict(vars(self))
+        if self.rows and self.wall_seconds:
+            record["rows_per_second"] = round(self.rows / self.wall_seconds, 1)
+        return record
+
+
+class IngestProfiler:
+    """Collects a StageRecord per `with profiler.stage(name):` block
+
+    tracemalloc slows allocation-heavy stages, so wall and CPU times
+    measured here are upper bounds of an unprofiled run.
+    """
+
+    def __init__(self):
+        self.stages = []
+        self._open = []
+        self._started_tracing = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name):
+        """Measure a block; stages may nest (e.g. the parse/insert/commit parts of an import)"""
+        record = StageRecord(name)
+        record.rss_before_bytes = current_rss()
+        self._peak_checkpoint()
+        self._open.append(record)
+        tracemalloc.reset_peak()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall_seconds = round(time.perf_counter() - wall_start, 6)
+            record.cpu_seconds = round(time.process_time() - cpu_start, 6)
+            self._peak_checkpoint()
+            self._open.pop()
+            record.rss_after_bytes = current_rss()
+            self.stages.append(record)
+
+    def _peak_checkpoint(self):
+        """Fold the tracemalloc peak since the last reset into every open stage"""
+        peak = tracemalloc.get_traced_memory()[1]
+        for record in self._open:
+            record.tracemalloc_peak_bytes = max(record.tracemalloc_peak_bytes, peak)
+        tracemalloc.reset_peak()
+
+    def report(self):
+        return {
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "stages": [record.as_dict() for record in self.stages],
+        }
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def print_summary(self):
+        print(f"{'stage':<24}{'wall s':>9}{'cpu s':>9}{'rows':>9}{'peak MB':>10}{'rss MB':>9}")
+        for record in self.stages:
+            rows = "" if record.rows is None else str(record.rows)
+            rss = "" if record.rss_after_bytes is None else f"{record.rss_after_bytes / 1e6:.1f}"
+            print(f"{record.name:<24}{record.wall_seconds:>9.3f}{record.cpu_seconds:>9.3f}"
+                  f"{rows:>9}{record.tracemalloc_peak_bytes / 1e6:>10.1f}{rss:>9}")
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off; stages cost nothing"""
+
+    @contextmanager
+    def stage(self, name):
+        yield StageRecord(name)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Netflix SQL Project - Keyset Pagination
+Pages through large result sets with seek predicates on the indexed
+(release_year, show_id) key instead of OFFSET, so every page costs the
+same as the first
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from sql_functions import connect
+
+BROWSE_INDEX = "idx_netflix_year_show"
+SORT_KEY = ("release_year", "show_id")
+BROWSE_COLUMNS = ("show_id", "title", "type", "release_year", "rating")
+
+# Browse mode -> (title, WHERE clause); mirrors the list-style quick queries
+BROWSE_MODES = {
+    '1': ("All titles", None),
+    '2': ("Movies", "type = 'Movie'"),
+    '3': ("TV Shows", "type = 'TV Show'"),
+    '4': ("Released in 2020", "release_year = 2020"),
+    '5': ("Documentaries", "listed_in LIKE '%Documentaries%'"),
+    '6': ("Content without director", "(director IS NULL OR director = '')"),
+}
+
+
+def ensure_browse_index(conn):
+    """Create the (release_year, show_id) index behind keyset browsing
+
+    In the compact layout netflix is a view, so the index goes on the
+    netflix_data table underneath it.
+    """
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = 'netflix'").fetchone()
+    table = "netflix_data" if row and row[0] == "view" else "netflix"
+    conn.execute(f"CREATE INDEX IF NOT EXISTS {BROWSE_INDEX} ON {table} (release_year, show_id)")
+    conn.commit()
+    return table
+
+
+class KeysetPager:
+    """Newest-first pages of a filtered result set, navigated forwards and backwards
+
+    Each page is fetched with `(release_year, show_id) < (last key)` (or `>`
+    the first key when going back) plus LIMIT, which the index answers
+    without walking the rows before the page. Titles without a
+    release_year have no position in the key order and are left out.
+    """
+
+    def __init__(self, conn, where=None, page_size=20, columns=BROWSE_COLUMNS, table="netflix",
+                 total=None):
+        self.conn = conn
+        self.where = f"release_year IS NOT NULL AND ({where})" if where else "release_year IS NOT NULL"
+        self.page_size = page_size
+        self.columns = columns
+        self.table = table
+        self.page_number = 0
+        self.first_key = None
+        self.last_key = None
+        self.has_next = False
+        self._total = total
+
+    @property
+    def total(self):
+        """Number of matching rows; counted once unless a cached total was passed in"""
+        if self._total is None:
+            self._total = self.conn.execute(
+                f"SELECT COUNT(*) FROM {self.table} WHERE {self.where}").fetchone()[0]
+        return self._total
+
+    @property
+    def page_count(self):
+        return max(1, -(-self.total // self.page_size))
+
+    def _fetch(self, seek, key, descending):
+        direction = "DESC" if descending else "ASC"
+        sql = f"SELECT {', '.join(self.columns)} FROM {self.table} WHERE {self.where}"
+        params = ()
+        if key is not None:
+            sql += f" AND (release_year, show_id) {seek} (?, ?)"
+            params = key
+        sql += f" ORDER BY release_year {direction}, show_id {direction} LIMIT ?"
+        # One extra row tells whether another page follows in this direction
+        rows = self.conn.execute(sql, params + (self.page_size + 1,)).fetchall()
+        return rows[:self.page_size], len(rows) > self.page_size
+
+    def _key(self, row):
+        return tuple(row[self.columns.index(column)] for column in SORT_KEY)
+
+    def _show(self, rows):
+        if rows:
+            self.first_key = self._key(rows[0])
+            self.last_key = self._key(rows[-1])
+        return rows
+
+    def first(self):
+        rows, self.has_next = self._fetch(None, None, descending=True)
+        self.page_number = 1
+        return self._show(rows)
+
+    def next_page(self):
+        """The page after the current one ([] at the end)"""
+        if not self.has_next:
+            return []
+        rows, self.has_next = self._fetch("<", self.last_key, descending=True)
+        self.page_number += 1
+        return self._show(rows)
+
+    def previous_page(self):
+        """The page before the current one ([] on the first page)"""
+        if self.page_number <= 1:
+            return []
+        rows, _ = self._fetch(">", self.first_key, descending=False)
+        rows.reverse()
+        self.page_number -= 1
+        self.has_next = True
+        return self._show(rows)
+
+
+def print_page(pager, rows, title=""):
+    print(f"\n► {title} - page {pager.page_number} of {pager.page_count} ({pager.total} titles)")
+    print("-" * 70)
+    for show_id, name, type_, year, rating in rows:
+        print(f"  {show_id:<7} {(name or '')[:40]:<40} {type_ or '':<8} {year} {rating or ''}")
+    print()
+
+
+def _offset_page(conn, page, page_size):
+    return conn.execute(
+        f"SELECT {', '.join(BROWSE_COLUMNS)} FROM netflix WHERE release_year IS NOT NULL "
+        f"ORDER BY release_year DESC, show_id DESC LIMIT ? OFFSET ?",
+        (page_size, (page - 1) * page_size)).fetchall()
+
+
+def main():
+    script_dir = Path(__file__).parent
+    db_path = script_dir / "netflix.db"
+
+    if not db_path.exists():
+        print(f"✗ Database not found: {db_path}")
+        print("Please run: python setup_sqlite.py")
+        sys.exit(1)
+
+    page_size = 20
+    conn = connect(str(db_path))
+    ensure_browse_index(conn)
+
+    pager = KeysetPager(conn, page_size=page_size)
+    start = time.perf_counter()
+    pager.first()
+    first_ms = (time.perf_counter() - start) * 1000
+    last_page = pager.page_count
+
+    # Walk to the last page; each step is a single index seek
+    step_ms = []
+    while pager.has_next:
+        start = time.perf_counter()
+        rows = pager.next_page()
+        step_ms.append((time.perf_counter() - start) * 1000)
+    last_rows = rows if step_ms else []
+
+    start = time.perf_counter()
+    offset_rows = _offset_page(conn, last_page, page_size)
+    offset_ms = (time.perf_counter() - start) * 1000
+    conn.close()
+
+    print(f"✓ {pager.total} titles in {last_page} pages of {page_size}")
+    print(f"✓ Keyset page 1: {first_ms:.2f} ms")
+    if step_ms:
+        print(f"✓ Keyset pages 2-{last_page}: {sum(step_ms) / len(step_ms):.2f} ms on average, "
+              f"{max(step_ms):.2f} ms at most")
+    print(f"✓ OFFSET page {last_page}: {offset_ms:.2f} ms")
+    if last_rows and list(map(tuple, last_rows)) != list(map(tuple, offset_rows)):
+        print("✗ Keyset and OFFSET disagree on the last page")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Netflix SQL Project - Fuzzy Name Index
+Typo-tolerant lookup of actors, directors and titles using a trigram
+inverted index with an edit-distance re-rank of the candidates
+"""
+
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter, namedtuple
+from itertools import chain
+from pathlib import Path
+
+from shared_scan import split_multi
+from sql_functions import connect
+
+NameMatch = namedtuple("NameMatch", ["name", "field", "distance", "show_ids"])
+
+
+def trigrams(text):
+    """Set of lowercase character trigrams of text, padded at word boundaries"""
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, max_distance=None):
+    """Levenshtein distance between a and b, or max_distance + 1 once it is exceeded"""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1,
+                               current[j - 1] + 1,
+                               previous[j - 1] + (ca != cb)))
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class NameIndex:
+    """Trigram inverted index over the distinct names in casts, director and title"""
+
+    def __init__(self):
+        self.names = []          # name id -> (field, name)
+        self.show_ids = []       # name id -> list of show_ids
+        self._ids = {}           # (field, name) -> name id
+        self.postings = {}       # trigram -> array of name ids
+
+    def add(self, field, name, show_id):
+        """Register one occurrence of a name for a show"""
+        key = (field, name)
+        name_id = self._ids.get(key)
+        if name_id is None:
+            name_id = len(self.names)
+            self._ids[key] = name_id
+            self.names.append(key)
+            self.show_ids.append([])
+            for gram in trigrams(name):
+                self.postings.setdefault(gram, array('I')).append(name_id)
+        self.show_ids[name_id].append(show_id)
+
+    @classmethod
+    def from_connection(cls, conn, table="netflix"):
+        """Build the index from the split casts, director and title values"""
+        index = cls()
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT show_id, title, director, casts FROM {table}")
+        for show_id, title, director, casts in cursor:
+            if title:
+                index.add("title", title.strip(), show_id)
+            for name in split_multi(director):
+                index.add("director", name, show_id)
+            for name in split_multi(casts):
+                index.add("casts", name, show_id)
+        return index
+
+    def lookup(self, query, fields=None, limit=10, max_distance=None, candidates=50):
+        """Return up to limit NameMatch tuples ranked by edit distance
+
+        max_distance defaults to a quarter of the query length, capped at 2.
+        The candidates sharing the most trigrams with the query are re-ranked
+        by edit distance.
+        """
+        query = query.strip()
+        if not query:
+            return []
+        if max_distance is None:
+            max_distance = min(2, len(query) // 4)
+        wanted = set(fields) if fields else None
+
+        overlap = self._overlap(trigrams(query), max_distance)
+        shortlist = sorted(overlap, key=overlap.get, reverse=True)
+        lowered = query.lower()
+        matches = []
+        for name_id in shortlist:
+            field, name = self.names[name_id]
+            if wanted is not None and field not in wanted:
+                continue
+            distance = edit_distance(lowered, name.lower(), max_distance)
+            if distance <= max_distance:
+                matches.append((distance, -overlap[name_id], name_id))
+            candidates -= 1
+            if candidates <= 0:
+                break
+
+        matches.sort()
+        return [NameMatch(self.names[name_id][1], self.names[name_id][0], distance,
+                          list(self.show_ids[name_id]))
+                for distance, _, name_id in matches[:limit]]
+
+    def _overlap(self, grams, max_distance):
+        """{name id: shared trigrams} for the names that can be within max_distance
+
+        One edit destroys at most three trigrams, so such a name shares at
+        least needed = len(grams) - 3 * max_distance of them. Only the shorter
+        posting lists are tallied; names whose tally is too low to reach
+        needed even with the (needed - 1) // 2 longest lists are dropped, and
+        the rest are looked up in those sorted lists by binary search,
+        stopping once the lists left cannot bring a name to needed.
+        """
+        postings = sorted((self.postings[gram] for gram in grams if gram in self.postings), key=len)
+        needed = max(1, len(grams) - 3 * max_distance)
+        long_lists = min((needed - 1) // 2, len(postings))
+        short, long = postings[:len(postings) - long_lists], postings[len(postings) - long_lists:]
+
+        overlap = {}
+        for name_id, count in Counter(chain.from_iterable(short)).items():
+            if count + long_lists < needed:
+                continue
+            remaining = long_lists
+            for posting in long:
+                if count + remaining < needed:
+                    break
+                position = bisect_left(posting, name_id)
+                if position < len(posting) and posting[position] == name_id:
+                    count += 1
+                remaining -= 1
+            if count >= needed:
+                overlap[name_id] = count
+        return overlap
+
+    def __len__(self):
+        return len(self.names)
+
+
+def print_matches(matches):
+    """Pretty print ranked name matches"""
+    if not matches:
+        print("No matches found")
+        return
+    print(f"{'name':<35} | {'field':<8} | {'dist':<4} | show_ids")
+    print("-" * 80)
+    for match in matches:
+        show_ids = ", ".join(match.show_ids[:8])
+        if len(match.show_ids) > 8:
+            show_ids += f", ... (+{len(match.show_ids) - 8})"
+        print(f"{match.name[:35]:<35} | {match.field:<8} | {match.distance:<4} | {show_ids}")
+    print(f"\nMatches: {len(matches)}\n")
+
+
+def main():
+    script_dir = Path(__file__).parent
+    db_path = script_dir / "netflix.db"
+
+    if not db_path.exists():
+        print(f"✗ Database not found: {db_path}")
+        print("Please run: python setup_sqlite.py")
+        sys.exit(1)
+
+    queries = sys.argv[1:] or ["Salman Kahn", "Rajiv Chilka"]
+
+    conn = connect(str(db_path))
+    start = time.perf_counter()
+    index = NameIndex.from_connection(conn)
+    conn.close()
+    print(f"✓ Indexed {len(index)} names in {time.perf_counter() - start:.2f}s\n")
+
+    for query in queries:
+        start = time.perf_counter()
+        matches = index.lookup(query)
+        elapsed = time.perf_counter() - start
+        print(f"► {query} ({elapsed * 1000:.2f} ms)")
+        print_matches(matches)
+
+
+if __name__ == "__main__":
+    main()
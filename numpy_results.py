@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Netflix SQL Project - NumPy Result Adapter
+Fetches query results in chunks straight into growing NumPy column arrays
+instead of materialising one sqlite3.Row per result row
+"""
+
+import sqlite3
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only this adapter needs it
+    np = None
+
+from sql_functions import connect
+
+# A dictionary-encoded string column: codes index into categories (-1 for NULL)
+EncodedColumn = namedtuple("EncodedColumn", ["codes", "categories"])
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy_results requires NumPy: pip install numpy")
+
+
+def _infer_dtype(values):
+    """int64 / float64 / object for a chunk of column values, None if all are NULL"""
+    kinds = {type(v) for v in values if v is not None}
+    if not kinds:
+        return None
+    if kinds <= {int}:
+        return np.dtype(np.float64) if None in values else np.dtype(np.int64)
+    if kinds <= {int, float}:
+        return np.dtype(np.float64)
+    return np.dtype(object)
+
+
+class _ColumnBuilder:
+    """A preallocated column array that doubles its capacity as chunks arrive
+
+    With dtype None the type is not known yet: leading all-NULL chunks are
+    only counted, and the first chunk holding a value settles the dtype and
+    back-fills them as NaN, None or code -1 like any later NULL. Float
+    columns also keep the fetched values, so widening them to object
+    restores ints and NULLs exactly instead of 2.0 and NaN.
+    """
+
+    def __init__(self, dtype, capacity, encode):
+        self.encode_strings = encode
+        self.encode = False
+        self.dtype = None
+        self.data = None
+        self.values = None
+        self.capacity = capacity or 0
+        self.size = 0
+        self.categories = {}
+        if dtype is not None:
+            self._settle(dtype)
+
+    def _settle(self, dtype):
+        if self.size and dtype.kind in 'iu':  # Leading NULLs need NaN
+            dtype = np.dtype(np.float64)
+        self.encode = self.encode_strings and dtype == object
+        self.dtype = np.dtype(np.int32) if self.encode else dtype
+        self.data = np.empty(max(self.capacity, self.size), dtype=self.dtype)
+        if self.size:
+            self.data[:self.size] = self._null()
+        if self.dtype.kind == 'f':
+            self.values = [None] * self.size
+
+    def _null(self):
+        if self.encode:
+            return -1
+        return np.nan if self.dtype.kind == 'f' else None
+
+    def _convert(self, values):
+        if self.encode:
+            categories = self.categories
+            return [-1 if v is None else categories.setdefault(v, len(categories)) for v in values]
+        if self.dtype.kind == 'f':
+            return [np.nan if v is None else v for v in values]
+        return values
+
+    def _fits(self, values):
+        """Whether values can be stored as they are; NumPy would silently truncate
+        floats and NULL-free checks are needed for integer columns"""
+        if self.encode or self.dtype.kind not in 'iu':
+            return True
+        info = np.iinfo(self.dtype)
+        return all(type(v) is int and info.min <= v <= info.max for v in values)
+
+    def _widen(self, values):
+        """Widen int -> float64 -> object so that values fit, keeping earlier rows exact"""
+        numeric = all(v is None or type(v) is float or (type(v) is int and -2 ** 63 <= v < 2 ** 63)
+                      for v in values)
+        if self.dtype.kind in 'iu' and numeric:
+            self.values = self.data[:self.size].tolist()
+            self.dtype = np.dtype(np.float64)
+            self.data = self.data.astype(self.dtype)
+            return
+        previous = self.values if self.dtype.kind == 'f' else self.data[:self.size].tolist()
+        self.dtype = np.dtype(object)
+        self.data = np.empty(len(self.data), dtype=self.dtype)
+        self.data[:self.size] = previous
+        self.values = None
+
+    def append(self, values):
+        if self.dtype is None:
+            dtype = _infer_dtype(values)
+            if dtype is None:
+                self.size += len(values)
+                return
+            self._settle(dtype)
+        end = self.size + len(values)
+        if end > len(self.data):
+            capacity = len(self.data) or 1
+            while capacity < end:
+                capacity *= 2
+            grown = np.empty(capacity, dtype=self.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+        if not self._fits(values):
+            self._widen(values)
+        try:
+            self.data[self.size:end] = self._convert(values)
+        except (TypeError, ValueError, OverflowError):
+            # A later chunk does not fit a float column (strings, huge ints): widen to object
+            self._widen(values)
+            self.data[self.size:end] = self._convert(values)
+        if self.values is not None:
+            self.values.extend(values)
+        self.size = end
+
+    def finish(self):
+        if self.dtype is None:  # Only NULLs so far, or no rows at all
+            if self.encode_strings:
+                return EncodedColumn(np.full(self.size, -1, dtype=np.int32), [])
+            return np.full(self.size, None, dtype=object)
+        data = self.data[:self.size].copy()
+        if self.encode:
+            return EncodedColumn(data, list(self.categories))
+        return data
+
+
+def fetch_arrays(cursor, sql=None, params=(), dtypes=None, chunk_size=4096,
+                 encode_strings=False, capacity=None):
+    """Run sql (or continue an executed cursor) and return {column: ndarray}
+
+    dtypes maps column names to declared NumPy dtypes; other columns are
+    inferred from their first chunk with a non-NULL value, and columns with
+    no value at all come back as object arrays of None. With
+    encode_strings, string and value-less columns are returned as
+    EncodedColumn(codes, categories).
+    """
+    _require_numpy()
+    if isinstance(cursor, sqlite3.Connection):
+        cursor = cursor.cursor()
+    if sql is not None:
+        cursor.execute(sql, params)
+    if cursor.description is None:
+        return {}
+
+    columns = [desc[0] for desc in cursor.description]
+    dtypes = dtypes or {}
+    builders = [_ColumnBuilder(np.dtype(dtypes[name]) if name in dtypes else None, capacity, encode_strings)
+                for name in columns]
+
+    while True:
+        chunk = cursor.fetchmany(chunk_size)
+        if not chunk:
+            break
+        for builder, values in zip(builders, zip(*chunk)):
+            builder.append(values)
+
+    return {name: builder.finish() for name, builder in zip(columns, builders)}
+
+
+def main():
+    script_dir = Path(__file__).parent
+    db_path = script_dir / "netflix.db"
+
+    if not db_path.exists():
+        print(f"✗ Database not found: {db_path}")
+        print("Please run: python setup_sqlite.py")
+        sys.exit(1)
+
+    _require_numpy()
+    conn = connect(str(db_path))
+    sql = "SELECT show_id, type, release_year, rating, country FROM netflix"
+
+    # Baseline: materialise every sqlite3.Row, then copy the columns into arrays
+    conn.row_factory = sqlite3.Row
+    start = time.perf_counter()
+    rows = conn.execute(sql).fetchall()
+    baseline = {name: np.array([row[name] for row in rows]) for name in rows[0].keys()}
+    row_elapsed = time.perf_counter() - start
+    conn.row_factory = None
+
+    start = time.perf_counter()
+    arrays = fetch_arrays(conn, sql, encode_strings=True)
+    array_elapsed = time.perf_counter() - start
+    conn.close()
+
+    print(f"✓ sqlite3.Row fetch + copy: {len(baseline['release_year'])} rows in {row_elapsed * 1000:.1f} ms")
+    print(f"✓ NumPy column fetch: {len(arrays['release_year'])} rows in {array_elapsed * 1000:.1f} ms\n")
+    for name, column in arrays.items():
+        if isinstance(column, EncodedColumn):
+            print(f"  {name:<14} int32 codes, {len(column.categories)} categories")
+        else:
+            print(f"  {name:<14} {column.dtype}")
+
+    years = arrays["release_year"]
+    print(f"\nrelease_year: min {years.min()}, max {years.max()}, mean {years.mean():.1f}")
+
+
+if __name__ == "__main__":
+    main()
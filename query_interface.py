@@ -6,20 +6,36 @@ Provides a command-line interface to query the Netflix database
 
 import sqlite3
 import sys
+import time
 from pathlib import Path
 from datetime import datetime
 
+from bitmap_index import BitmapIndex, print_facets
+from keyset_browse import BROWSE_MODES, KeysetPager, ensure_browse_index, print_page
+from metrics import REGISTRY, observe_query
+from name_index import NameIndex, print_matches
+from numpy_results import fetch_arrays
+from sample_tables import approximate_sql, available_samples, register_sample_aggregates
+from similarity import has_similarity_index, similar_titles
+from sql_functions import connect
+from time_index import TimeIndex, years_back
+
 class NetflixQueryInterface:
     def __init__(self, db_path):
         self.db_path = db_path
         self.conn = None
         self.cursor = None
+        self.name_index = None
+        self.time_index = None
+        self.bitmap_index = None
+        self.browse_totals = {}
+        self.sample_table = None
         self.connect()
     
     def connect(self):
         """Connect to the database"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = connect(self.db_path)
             self.conn.row_factory = sqlite3.Row
             self.cursor = self.conn.cursor()
             print(f"✓ Connected to database: {self.db_path}")
@@ -27,11 +43,23 @@ class NetflixQueryInterface:
             print(f"✗ Connection error: {e}")
             sys.exit(1)
     
-    def execute_query(self, sql):
-        """Execute a SQL query and return results"""
+    def execute_query(self, sql, name="custom"):
+        """Execute a SQL query and return results; recorded in metrics under name"""
+        start = time.perf_counter()
         try:
             self.cursor.execute(sql)
-            return self.cursor.fetchall()
+            results = self.cursor.fetchall()
+        except sqlite3.Error as e:
+            observe_query("query_interface", name, time.perf_counter() - start, error=True)
+            print(f"✗ Query error: {e}")
+            return None
+        observe_query("query_interface", name, time.perf_counter() - start, len(results))
+        return results
+    
+    def execute_arrays(self, sql, **options):
+        """Execute a SQL query and return its columns as NumPy arrays (see numpy_results)"""
+        try:
+            return fetch_arrays(self.conn.cursor(), sql, **options)
         except sqlite3.Error as e:
             print(f"✗ Query error: {e}")
             return None
@@ -52,7 +80,7 @@ class NetflixQueryInterface:
         col_widths = [max(len(col), 15) for col in columns]
         for row in results[:limit]:
             for i, col in enumerate(columns):
-                col_widths[i] = max(col_widths[i], len(str(row[col]))[:50])
+                col_widths[i] = max(col_widths[i], min(len(str(row[col])), 50))
         
         # Print header
         header = " │ ".join(col.ljust(width) for col, width in zip(columns, col_widths))
@@ -91,6 +119,13 @@ class NetflixQueryInterface:
         print("  11. Content by 'kill' or 'violence' keywords")
         print("  12. Search by keyword")
         print("  13. Custom SQL query")
+        print("  14. Fuzzy name lookup (actors, directors, titles)")
+        print("  15. Content added in a date window (time index)")
+        print("  16. More like this (similar titles)")
+        print("  17. Browse content page by page")
+        print(f"  18. Approximate mode for custom SQL [{self.sample_table or 'off'}]")
+        print("  19. Export runtime metrics (OpenMetrics)")
+        print("  20. Faceted search (bitmap index)")
         print("  0. Exit")
         print("="*70 + "\n")
     
@@ -107,9 +142,9 @@ class NetflixQueryInterface:
                   "Movies from 2020"),
             '4': ("SELECT country, COUNT(*) as count FROM netflix WHERE country IS NOT NULL GROUP BY country ORDER BY count DESC LIMIT 5;",
                   "Top 5 countries"),
-            '5': ("SELECT title, type, duration FROM netflix WHERE type = 'Movie' ORDER BY CAST(SUBSTR(duration, 1, INSTR(duration, ' ') - 1) AS INTEGER) DESC LIMIT 1;",
+            '5': ("SELECT title, type, duration FROM netflix WHERE type = 'Movie' ORDER BY duration_value(duration) DESC LIMIT 1;",
                   "Longest movie"),
-            '6': ("SELECT title, duration FROM netflix WHERE type = 'TV Show' AND CAST(SUBSTR(duration, 1, INSTR(duration, ' ') - 1) AS INTEGER) > 5 ORDER BY CAST(SUBSTR(duration, 1, INSTR(duration, ' ') - 1) AS INTEGER) DESC LIMIT 20;",
+            '6': ("SELECT title, duration FROM netflix WHERE type = 'TV Show' AND duration_value(duration) > 5 ORDER BY duration_value(duration) DESC LIMIT 20;",
                   "TV shows with 5+ seasons"),
             '7': ("SELECT title, type, rating FROM netflix WHERE listed_in LIKE '%Documentaries%' LIMIT 20;",
                   "Documentaries"),
@@ -119,12 +154,8 @@ class NetflixQueryInterface:
                   "Salman Khan appearances"),
             '10': ("SELECT COUNT(*) as appearances FROM netflix WHERE country LIKE '%India%' LIMIT 10;",
                    "Indian content count"),
-            '11': ("""SELECT 
-                      CASE WHEN description LIKE '%kill%' OR description LIKE '%violence%' 
-                           OR description LIKE '%Kill%' OR description LIKE '%Violence%' 
-                      THEN 'Bad' ELSE 'Good' END as category,
-                      COUNT(*) as count
-                      FROM netflix GROUP BY category;""",
+            '11': ("""SELECT content_category(description) as category, COUNT(*) as count
+                      FROM netflix GROUP BY content_category(description);""",
                    "Content by keywords"),
         }
         
@@ -132,7 +163,7 @@ class NetflixQueryInterface:
             sql, title = queries[choice]
             print(f"\n► {title}")
             print("-" * 70)
-            results = self.execute_query(sql)
+            results = self.execute_query(sql, f"quick_{choice}")
             if results is not None:
                 self.display_results(results)
         else:
@@ -153,12 +184,39 @@ class NetflixQueryInterface:
         
         sql = "\n".join(lines)
         
-        if sql.strip():
-            print("\nExecuting query...")
+        if not sql.strip():
+            return
+
+        approximate = None
+        if self.sample_table:
+            try:
+                approximate = approximate_sql(sql, self.sample_table)
+            except ValueError as e:
+                print(f"✗ Cannot run approximately: {e}. Running the exact query instead.")
+
+        if approximate:
+            register_sample_aggregates(self.conn, self.sample_table)
+            print(f"\nExecuting query on {self.sample_table} (approximate)...")
             print("-" * 70)
-            results = self.execute_query(sql)
-            if results is not None:
-                self.display_results(results)
+            start = time.perf_counter()
+            results = self.execute_query(approximate, "custom_approximate")
+            elapsed = time.perf_counter() - start
+            if results is None:
+                return
+            self.display_results(results)
+            print(f"COUNT(*) values are scaled estimates; *ci95 columns are 95% confidence "
+                  f"half-widths ({elapsed * 1000:.1f} ms)")
+            if input("Press 'e' for exact results, Enter to continue: ").strip().lower() != 'e':
+                return
+
+        print("\nExecuting query...")
+        print("-" * 70)
+        start = time.perf_counter()
+        results = self.execute_query(sql)
+        if results is not None:
+            self.display_results(results)
+            if approximate:
+                print(f"Exact results ({(time.perf_counter() - start) * 1000:.1f} ms)")
     
     def search_by_keyword(self):
         """Search content by title or description keyword"""
@@ -178,17 +236,196 @@ class NetflixQueryInterface:
         
         print(f"\nSearching for: {keyword}")
         print("-" * 70)
-        results = self.execute_query(sql)
+        results = self.execute_query(sql, "keyword_search")
         if results is not None:
             self.display_results(results)
     
+    def fuzzy_name_lookup(self):
+        """Typo-tolerant lookup of actors, directors and titles"""
+        name = input("Enter actor, director or title: ").strip()
+
+        if not name:
+            print("No name provided!")
+            return
+
+        if self.name_index is None:
+            print("Building name index...")
+            self.name_index = NameIndex.from_connection(self.conn)
+
+        print(f"\nClosest matches for: {name}")
+        print("-" * 70)
+        print_matches(self.name_index.lookup(name))
+
+    def time_window_query(self):
+        """Count content added between two dates from the date_added time index"""
+        if self.time_index is None:
+            self.time_index = TimeIndex.load(self.conn) or TimeIndex.from_connection(self.conn)
+
+        latest = self.time_index.latest()
+        if latest is None:
+            print("No dated content found!")
+            return
+
+        default_start = years_back(latest, 5)
+        try:
+            start = input(f"Start date YYYY-MM-DD [{default_start}]: ").strip()
+            end = input(f"End date YYYY-MM-DD [{latest}]: ").strip()
+            start = datetime.strptime(start, "%Y-%m-%d").date() if start else default_start
+            end = datetime.strptime(end, "%Y-%m-%d").date() if end else latest
+        except ValueError:
+            print("Invalid date! Use YYYY-MM-DD.")
+            return
+
+        print(f"\n► Content added {start} .. {end}")
+        print("-" * 70)
+        print(f"Total: {self.time_index.count(start, end)}")
+        by_type = self.time_index.breakdown(start, end, "type")
+        for type_, count in sorted(by_type.items(), key=lambda item: -item[1]):
+            print(f"  {type_:<12} {count}")
+        print("\nPer year:")
+        for label, count in self.time_index.trend(start, end, by="year"):
+            print(f"  {label:<12} {count}")
+        print()
+
+    def more_like_this(self):
+        """Show the precomputed most similar titles for a title"""
+        if not has_similarity_index(self.conn):
+            print("Similarity index not built yet!")
+            print("Please run: python similarity.py")
+            return
+
+        title = input("Enter title: ").strip()
+        if not title:
+            print("No title provided!")
+            return
+
+        self.cursor.execute(
+            "SELECT show_id, title FROM netflix WHERE title = ? OR title LIKE ? "
+            "ORDER BY title = ? DESC LIMIT 1",
+            (title, f"%{title}%", title))
+        match = self.cursor.fetchone()
+        if match is None:
+            print(f"No title found for: {title}")
+            return
+
+        print(f"\n► More like {match['title']}")
+        print("-" * 70)
+        for show_id, similar, type_, year, score in similar_titles(self.conn, match['show_id']):
+            print(f"  {score:.3f}  {similar[:45]:<45} {type_:<8} {year}")
+        print()
+
+    def browse(self):
+        """Page through a browse mode with keyset pagination"""
+        print("\nBrowse modes:")
+        for key, (title, _) in BROWSE_MODES.items():
+            print(f"  {key}. {title}")
+        mode = input("Choose a mode: ").strip()
+        if mode not in BROWSE_MODES:
+            print("Invalid choice!")
+            return
+
+        try:
+            ensure_browse_index(self.conn)
+        except sqlite3.Error as e:
+            print(f"✗ Could not create browse index ({e}); browsing without it")
+
+        title, where = BROWSE_MODES[mode]
+        # Totals are cached per mode so reopening a mode skips the COUNT(*)
+        pager = KeysetPager(self.conn, where, total=self.browse_totals.get(mode))
+        self.browse_totals[mode] = pager.total
+
+        rows = pager.first()
+        while True:
+            if not rows:
+                print("No results returned")
+            else:
+                print_page(pager, rows, title)
+            action = input("[n]ext, [p]revious, [q]uit: ").strip().lower()
+            if action == 'n':
+                if pager.has_next:
+                    rows = pager.next_page()
+                else:
+                    print("Already on the last page")
+            elif action == 'p':
+                if pager.page_number > 1:
+                    rows = pager.previous_page()
+                else:
+                    print("Already on the first page")
+            elif action == 'q':
+                break
+
+    def choose_sample(self):
+        """Switch custom SQL between exact results and a stratified sample"""
+        samples = available_samples(self.conn)
+        if not samples:
+            print("No sample tables found!")
+            print("Please run: python sample_tables.py --build")
+            return
+
+        print("\nSamples (stratified by type and release_year):")
+        names = list(samples)
+        for number, name in enumerate(names, 1):
+            population, sampled = samples[name]
+            print(f"  {number}. {name:<20} {sampled} of {population} rows")
+        print("  0. Off (exact results)")
+        choice = input("Choose a sample: ").strip()
+
+        if choice == '0':
+            self.sample_table = None
+        elif choice.isdigit() and 1 <= int(choice) <= len(names):
+            self.sample_table = names[int(choice) - 1]
+        else:
+            print("Invalid choice!")
+            return
+        print(f"✓ Approximate mode: {self.sample_table or 'off'}")
+
+    def faceted_search(self):
+        """Filter on type, rating, genre, country and year with the bitmap index"""
+        if self.bitmap_index is None:
+            self.bitmap_index = BitmapIndex.load(self.conn) or BitmapIndex.from_connection(self.conn)
+
+        print("\nExample: rating = TV-MA AND genre = Dramas AND "
+              "(country = India OR country = \"United Kingdom\") AND year > 2015")
+        expression = input("Filter (empty for all titles): ").strip()
+
+        start = time.perf_counter()
+        try:
+            bitmap = self.bitmap_index.evaluate(expression) if expression else self.bitmap_index.all
+        except ValueError as e:
+            print(f"✗ {e}")
+            return
+        counts = self.bitmap_index.facet_counts(bitmap)
+        show_ids = self.bitmap_index.show_ids_for(bitmap, 10)
+        elapsed = time.perf_counter() - start
+
+        print(f"\n► {self.bitmap_index.count(bitmap)} matching titles ({elapsed * 1000:.2f} ms)")
+        print("-" * 70)
+        if show_ids:
+            placeholders = ", ".join("?" * len(show_ids))
+            self.cursor.execute(f"SELECT show_id, title, type, release_year FROM netflix "
+                                f"WHERE show_id IN ({placeholders})", show_ids)
+            titles = {row['show_id']: row for row in self.cursor.fetchall()}
+            for show_id in show_ids:
+                row = titles.get(show_id)
+                if row is not None:
+                    print(f"  {show_id:<7} {(row['title'] or '')[:45]:<45} {row['type']:<8} {row['release_year']}")
+        print("\nFacets:")
+        print_facets(counts)
+        print()
+
+    def export_metrics(self):
+        """Write the session's query metrics as OpenMetrics text"""
+        path = Path(self.db_path).parent / "metrics.prom"
+        REGISTRY.write(path)
+        print(f"✓ Metrics written to: {path}")
+
     def run(self):
         """Main interface loop"""
         print("\n✓ Database ready for queries!\n")
         
         while True:
             self.show_menu()
-            choice = input("Enter your choice (0-13): ").strip()
+            choice = input("Enter your choice (0-20): ").strip()
             
             if choice == '0':
                 print("\n✓ Goodbye!\n")
@@ -197,6 +434,20 @@ class NetflixQueryInterface:
                 self.search_by_keyword()
             elif choice == '13':
                 self.run_custom_query()
+            elif choice == '14':
+                self.fuzzy_name_lookup()
+            elif choice == '15':
+                self.time_window_query()
+            elif choice == '16':
+                self.more_like_this()
+            elif choice == '17':
+                self.browse()
+            elif choice == '18':
+                self.choose_sample()
+            elif choice == '19':
+                self.export_metrics()
+            elif choice == '20':
+                self.faceted_search()
             elif choice in ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11']:
                 self.run_quick_query(choice)
             else:
@@ -217,6 +468,11 @@ def main():
         print("Please run: python setup_sqlite.py")
         sys.exit(1)
     
+    args = sys.argv[1:]
+    if "--metrics-port" in args:
+        host, port = REGISTRY.serve(int(args[args.index("--metrics-port") + 1]))
+        print(f"✓ Serving metrics on http://{host}:{port}/metrics")
+    
     interface = NetflixQueryInterface(str(db_path))
     try:
         interface.run()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Netflix SQL Project - Incremental Report Builder
+Renders each business query to Markdown, HTML and JSON artifacts and only
+rebuilds the ones whose query text or database content changed
+"""
+
+import hashlib
+import html
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from run_all_queries import QUERIES
+from sql_functions import connect
+
+FORMATS = ("md", "html", "json")
+MANIFEST_NAME = "manifest.json"
+# Bump when the rendered output changes so every artifact is rebuilt
+RENDER_VERSION = "1"
+
+
+def database_fingerprint(db_path, manifest=None):
+    """Content hash of the database file
+
+    The hash is reused from the previous manifest while the file's size
+    and modification time are unchanged, so unchanged data costs one stat().
+    """
+    stat = os.stat(db_path)
+    signature = [stat.st_size, stat.st_mtime_ns]
+    if manifest and manifest.get("db_signature") == signature:
+        return manifest["db_fingerprint"], signature
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(db_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest(), signature
+
+
+def artifact_key(sql, fingerprint):
+    """Cache key for one query's artifacts"""
+    digest = hashlib.sha256()
+    for part in (RENDER_VERSION, " ".join(sql.split()), fingerprint):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:24]
+
+
+def render_markdown(title, columns, rows):
+    lines = [f"# {title}", "", "| " + " | ".join(columns) + " |",
+             "|" + "|".join("---" for _ in columns) + "|"]
+    for row in rows:
+        values = ["NULL" if v is None else str(v).replace("|", "\\|") for v in row]
+        lines.append("| " + " | ".join(values) + " |")
+    lines += ["", f"Total rows: {len(rows)}", ""]
+    return "\n".join(lines)
+
+
+def render_html(title, columns, rows):
+    header = "".join(f"<th>{html.escape(c)}</th>" for c in columns)
+    body = "\n".join(
+        "<tr>" + "".join(f"<td>{html.escape('NULL' if v is None else str(v))}</td>" for v in row) + "</tr>"
+        for row in rows)
+    return (f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title></head>\n"
+            f"<body>\n<h1>{html.escape(title)}</h1>\n<table>\n<tr>{header}</tr>\n{body}\n</table>\n"
+            f"<p>Total rows: {len(rows)}</p>\n</body></html>\n")
+
+
+def render_json(title, columns, rows):
+    return json.dumps({"title": title, "columns": columns, "rows": [list(r) for r in rows]},
+                      indent=2, ensure_ascii=False) + "\n"
+
+
+RENDERERS = {"md": render_markdown, "html": render_html, "json": render_json}
+
+
+def artifact_paths(out_dir, query_num):
+    return {fmt: Path(out_dir) / f"query_{query_num:02d}.{fmt}" for fmt in FORMATS}
+
+
+def build_artifact(task):
+    """Worker: run one query and write its artifacts"""
+    db_path, out_dir, query_num, title, sql = task
+    conn = connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        cursor = conn.execute(sql)
+        columns = [desc[0] for desc in cursor.description]
+        rows = cursor.fetchall()
+    finally:
+        conn.close()
+
+    for fmt, path in artifact_paths(out_dir, query_num).items():
+        path.write_text(RENDERERS[fmt](title, columns, rows), encoding='utf-8')
+    return query_num, len(rows)
+
+
+def load_manifest(out_dir):
+    manifest_path = Path(out_dir) / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def build_reports(db_path, out_dir, jobs=None, force=False):
+    """Rebuild stale artifacts in parallel; returns (rebuilt query numbers, total queries)"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    fingerprint, signature = database_fingerprint(db_path, manifest)
+
+    keys = {}
+    stale = []
+    for query_num, (title, sql) in enumerate(QUERIES, 1):
+        key = artifact_key(sql, fingerprint)
+        keys[str(query_num)] = key
+        up_to_date = (not force
+                      and manifest.get("artifacts", {}).get(str(query_num)) == key
+                      and all(path.exists() for path in artifact_paths(out_dir, query_num).values()))
+        if not up_to_date:
+            stale.append((str(db_path), str(out_dir), query_num, title, sql))
+
+    if stale:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            list(executor.map(build_artifact, stale))
+
+    manifest = {
+        "db_fingerprint": fingerprint,
+        "db_signature": signature,
+        "artifacts": keys,
+    }
+    with open(out_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    index_lines = ["# Netflix SQL Project - Reports", ""]
+    for query_num, (title, _) in enumerate(QUERIES, 1):
+        index_lines.append(f"{query_num}. [{title}](query_{query_num:02d}.md)")
+    (out_dir / "index.md").write_text("\n".join(index_lines) + "\n", encoding='utf-8')
+
+    return [task[2] for task in stale], len(QUERIES)
+
+
+def main():
+    script_dir = Path(__file__).parent
+    db_path = script_dir / "netflix.db"
+
+    args = sys.argv[1:]
+    out_dir = Path(args[args.index("--out") + 1]) if "--out" in args else script_dir / "reports"
+    jobs = int(args[args.index("--jobs") + 1]) if "--jobs" in args else None
+    force = "--force" in args
+
+    if not db_path.exists():
+        print(f"✗ Database not found: {db_path}")
+        print("Please run: python setup_sqlite.py")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    rebuilt, total = build_reports(db_path, out_dir, jobs, force)
+    elapsed = time.perf_counter() - start
+
+    print(f"✓ Reports up to date in {out_dir} ({elapsed:.2f}s)")
+    print(f"  Rebuilt {len(rebuilt)} of {total} artifacts"
+          + (f": {', '.join(map(str, rebuilt))}" if rebuilt else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
-import sqlite3
+import sys
+import time
 from pathlib import Path
 
+from metrics import REGISTRY, observe_query
+from sql_functions import connect
+
 db_path = Path(__file__).parent / "netflix.db"
 
 QUERIES = [
@@ -28,7 +32,7 @@ QUERIES = [
     ("Identify the longest movie",
      """SELECT title, duration FROM netflix 
         WHERE type = 'Movie' AND duration IS NOT NULL
-        ORDER BY CAST(SUBSTR(duration, 1, INSTR(duration, ' ') - 1) AS INTEGER) DESC 
+        ORDER BY duration_value(duration) DESC 
         LIMIT 1"""),
     
     ("Find content added in the last 5 years",
@@ -45,8 +49,8 @@ QUERIES = [
     ("List all TV shows with more than 5 seasons",
      """SELECT title, duration FROM netflix 
         WHERE type = 'TV Show' 
-        AND CAST(SUBSTR(duration, 1, INSTR(duration, ' ') - 1) AS INTEGER) > 5
-        ORDER BY CAST(SUBSTR(duration, 1, INSTR(duration, ' ') - 1) AS INTEGER) DESC 
+        AND duration_value(duration) > 5
+        ORDER BY duration_value(duration) DESC 
         LIMIT 10"""),
     
     ("Count the number of content items in each genre",
@@ -90,13 +94,10 @@ QUERIES = [
         LIMIT 10"""),
     
     ("Categorize content by 'kill' and 'violence' keywords",
-     """SELECT 
-        CASE WHEN description LIKE '%kill%' OR description LIKE '%Kill%' 
-             OR description LIKE '%violence%' OR description LIKE '%Violence%'
-        THEN 'Bad' ELSE 'Good' END as category,
+     """SELECT content_category(description) as category,
         COUNT(*) as content_count 
         FROM netflix 
-        GROUP BY category 
+        GROUP BY content_category(description) 
         ORDER BY content_count DESC"""),
 ]
 
@@ -142,7 +143,7 @@ def main():
     print("NETFLIX SQL PROJECT - EXECUTING ALL 15 BUSINESS QUERIES")
     print("="*80 + "\n")
     
-    conn = sqlite3.connect(str(db_path))
+    conn = connect(str(db_path))
     cursor = conn.cursor()
     
     successful = 0
@@ -152,12 +153,15 @@ def main():
         print(f"Query {idx}: {title}")
         print("-" * 80)
         
+        start = time.perf_counter()
         try:
             cursor.execute(sql)
             results = cursor.fetchall()
+            observe_query("run_all_queries", idx, time.perf_counter() - start, len(results))
             print_results(results)
             successful += 1
         except Exception as e:
+            observe_query("run_all_queries", idx, time.perf_counter() - start, error=True)
             print(f"  Error: {str(e)}\n")
             failed += 1
     
@@ -166,6 +170,13 @@ def main():
     print("="*80)
     print(f"SUMMARY: {successful} successful | {failed} failed out of {len(QUERIES)} queries")
     print("="*80 + "\n")
+    
+    args = sys.argv[1:]
+    if "--metrics" in args:
+        position = args.index("--metrics") + 1
+        metrics_path = Path(args[position]) if position < len(args) else db_path.parent / "metrics.prom"
+        REGISTRY.write(metrics_path)
+        print(f"✓ Metrics written to: {metrics_path}\n")
 
 if __name__ == "__main__":
     main()
@@ -8,6 +8,8 @@ import sqlite3
 import os
 from pathlib import Path
 
+from sql_functions import connect
+
 QUERIES = {
     1: {
         "title": "Count the number of Movies vs TV Shows",
@@ -93,9 +95,7 @@ QUERIES = {
             release_year
         FROM netflix
         WHERE type = 'Movie'
-        ORDER BY CAST(
-            SUBSTR(duration, 1, INSTR(duration, ' ') - 1) AS INTEGER
-        ) DESC
+        ORDER BY duration_value(duration) DESC
         LIMIT 1;
         """
     },
@@ -137,8 +137,8 @@ QUERIES = {
             release_year
         FROM netflix
         WHERE type = 'TV Show'
-        AND CAST(SUBSTR(duration, 1, INSTR(duration, ' ') - 1) AS INTEGER) > 5
-        ORDER BY CAST(SUBSTR(duration, 1, INSTR(duration, ' ') - 1) AS INTEGER) DESC
+        AND duration_value(duration) > 5
+        ORDER BY duration_value(duration) DESC
         LIMIT 20;
         """
     },
@@ -146,17 +146,11 @@ QUERIES = {
         "title": "Count the number of content items in each genre",
         "sql": """
         SELECT 
-            TRIM(genre) as genre,
+            first_genre(listed_in) as genre,
             COUNT(*) as total_content
-        FROM (
-            SELECT 
-                TRIM(substr(listed_in, 0, instr(listed_in || ',', ','))) as genre,
-                listed_in
-            FROM netflix
-            WHERE listed_in IS NOT NULL
-        )
-        WHERE genre != ''
-        GROUP BY genre
+        FROM netflix
+        WHERE first_genre(listed_in) != ''
+        GROUP BY first_genre(listed_in)
         ORDER BY total_content DESC
         LIMIT 20;
         """
@@ -253,21 +247,10 @@ QUERIES = {
         "title": "Categorize content based on 'kill' and 'violence' keywords. Label 'Bad' if keywords present, 'Good' otherwise",
         "sql": """
         SELECT 
-            category,
+            content_category(description) AS category,
             COUNT(*) AS content_count
-        FROM (
-            SELECT 
-                CASE 
-                    WHEN description LIKE '%kill%' 
-                         OR description LIKE '%violence%'
-                         OR description LIKE '%Kill%'
-                         OR description LIKE '%Violence%'
-                    THEN 'Bad'
-                    ELSE 'Good'
-                END AS category
-            FROM netflix
-        ) AS categorized_content
-        GROUP BY category
+        FROM netflix
+        GROUP BY content_category(description)
         ORDER BY content_count DESC;
         """
     }
@@ -276,13 +259,23 @@ QUERIES = {
 def connect_db(db_path):
     """Connect to SQLite database"""
     try:
-        conn = sqlite3.connect(db_path)
+        conn = connect(db_path)
         conn.row_factory = sqlite3.Row
         return conn
     except sqlite3.Error as e:
         print(f"✗ Error connecting to database: {e}")
         return None
 
+def fetch_query_arrays(db_path, query_num, **options):
+    """Run one of QUERIES and return its columns as NumPy arrays (see numpy_results)"""
+    from numpy_results import fetch_arrays
+
+    conn = connect(db_path)
+    try:
+        return fetch_arrays(conn.cursor(), QUERIES[query_num]["sql"], **options)
+    finally:
+        conn.close()
+
 def print_results(title, results):
     """Pretty print query results"""
     print(f"\n{'='*80}")
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Netflix SQL Project - Stratified Sample Tables
+Keeps samples of the catalog stratified by type and release_year at a few
+sampling rates, and runs COUNT queries against them with scaled-up
+estimates and 95% confidence intervals
+"""
+
+import math
+import re
+import sqlite3
+import sys
+import time
+import zlib
+from pathlib import Path
+
+from sql_functions import connect
+
+SAMPLE_RATES = (0.01, 0.05, 0.2)
+STRATA_TABLE = "sample_strata"
+Z_95 = 1.959964
+
+_SQL_TOKEN_RE = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>--[^\n]*|/\*.*?(?:\*/|$))
+  | (?P<string>'(?:[^']|'')*'?)
+  | (?P<quoted>"(?:[^"]|"")*"?|`[^`]*`?|\[[^\]]*\]?)
+  | (?P<word>[^\W\d]\w*)
+  | (?P<number>\d[\w.]*)
+  | (?P<punct>.)
+""", re.VERBOSE | re.DOTALL)
+
+# Query shapes the rewrite cannot scale correctly
+UNSUPPORTED_WORDS = {
+    "WITH": "common table expressions",
+    "UNION": "compound queries",
+    "INTERSECT": "compound queries",
+    "EXCEPT": "compound queries",
+    "JOIN": "joins",
+    "OVER": "window functions",
+}
+UNSCALED_AGGREGATES = {"SUM", "TOTAL"}
+# Words that end a select item rather than name it
+_CLAUSE_WORDS = {"FROM", "WHERE", "GROUP", "HAVING", "ORDER", "LIMIT", "AS"}
+
+
+def sample_table_name(rate):
+    """netflix_sample_5 for a 5% sample"""
+    return f"netflix_sample_{rate * 100:g}".replace(".", "_")
+
+
+def _sample_order(show_id):
+    """Stable pseudo-random position of a title within its stratum"""
+    return zlib.crc32(str(show_id).encode('utf-8'))
+
+
+def build_samples(conn, rates=SAMPLE_RATES, table="netflix"):
+    """(Re)build one stratified sample table per rate plus the strata sizes
+
+    Every (type, release_year) stratum keeps round(rate * size) titles, and
+    at least one, chosen by a hash of show_id so rebuilds pick the same rows.
+    Returns {sample table: sampled rows}.
+    """
+    strata = {}
+    for show_id, type_, year in conn.execute(f"SELECT show_id, type, release_year FROM {table}"):
+        strata.setdefault((type_, year), []).append(show_id)
+    keys = sorted(strata, key=lambda key: (key[0] or "", key[1] if key[1] is not None else -1))
+    for members in strata.values():
+        members.sort(key=_sample_order)
+
+    cursor = conn.cursor()
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {STRATA_TABLE} (
+        sample_table TEXT,
+        stratum INTEGER,
+        type TEXT,
+        release_year INTEGER,
+        population INTEGER,
+        sampled INTEGER,
+        PRIMARY KEY (sample_table, stratum)
+    ) WITHOUT ROWID
+    """)
+    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS sample_pick (show_id TEXT PRIMARY KEY, "
+                   "stratum INTEGER, sample_weight REAL)")
+
+    sizes = {}
+    for rate in rates:
+        name = sample_table_name(rate)
+        picks = []
+        strata_rows = []
+        for stratum, key in enumerate(keys):
+            members = strata[key]
+            sampled = max(1, round(rate * len(members)))
+            weight = len(members) / sampled
+            picks.extend((show_id, stratum, weight) for show_id in members[:sampled])
+            strata_rows.append((name, stratum, key[0], key[1], len(members), sampled))
+
+        cursor.execute("DELETE FROM sample_pick")
+        cursor.executemany("INSERT INTO sample_pick VALUES (?, ?, ?)", picks)
+        cursor.execute(f"DROP TABLE IF EXISTS {name}")
+        cursor.execute(f"""
+        CREATE TABLE {name} AS
+        SELECT n.*, p.stratum, p.sample_weight
+        FROM {table} n JOIN sample_pick p ON p.show_id = n.show_id
+        """)
+        cursor.execute(f"DELETE FROM {STRATA_TABLE} WHERE sample_table = ?", (name,))
+        cursor.executemany(f"INSERT INTO {STRATA_TABLE} VALUES (?, ?, ?, ?, ?, ?)", strata_rows)
+        sizes[name] = len(picks)
+
+    cursor.execute("DROP TABLE sample_pick")
+    conn.commit()
+    return sizes
+
+
+def available_samples(conn):
+    """{sample table: (population, sampled)} for the samples in the database"""
+    try:
+        rows = conn.execute(f"SELECT sample_table, SUM(population), SUM(sampled) "
+                            f"FROM {STRATA_TABLE} GROUP BY sample_table ORDER BY SUM(sampled)").fetchall()
+    except sqlite3.OperationalError:  # No sample tables built yet
+        return {}
+    return {name: (population, sampled) for name, population, sampled in rows}
+
+
+def _count_aggregates(strata):
+    """approx_count / approx_margin aggregate classes for {stratum: (population, sampled)}"""
+
+    class _StratumCounts:
+        def __init__(self):
+            self.counts = {}
+
+        def step(self, stratum):
+            self.counts[stratum] = self.counts.get(stratum, 0) + 1
+
+        def estimate(self):
+            total = 0.0
+            variance = 0.0
+            for stratum, count in self.counts.items():
+                population, sampled = strata[stratum]
+                total += population / sampled * count
+                if sampled > 1:
+                    share = count / sampled
+                    variance += (population ** 2 * (1 - sampled / population)
+                                 * share * (1 - share) / (sampled - 1))
+            return total, variance
+
+    class ApproxCount(_StratumCounts):
+        def finalize(self):
+            return round(self.estimate()[0])
+
+    class ApproxMargin(_StratumCounts):
+        def finalize(self):
+            return round(Z_95 * math.sqrt(self.estimate()[1]), 1)
+
+    return ApproxCount, ApproxMargin
+
+
+def register_sample_aggregates(conn, sample_table):
+    """Register approx_count(stratum) and approx_margin(stratum) for one sample table"""
+    strata = {stratum: (population, sampled) for stratum, population, sampled in conn.execute(
+        f"SELECT stratum, population, sampled FROM {STRATA_TABLE} WHERE sample_table = ?",
+        (sample_table,))}
+    approx_count, approx_margin = _count_aggregates(strata)
+    conn.create_aggregate("approx_count", 1, approx_count)
+    conn.create_aggregate("approx_margin", 1, approx_margin)
+
+
+def _tokenize_sql(sql):
+    """[kind, text] tokens; strings, quoted identifiers and comments stay whole"""
+    return [[match.lastgroup, match.group()] for match in _SQL_TOKEN_RE.finditer(sql)]
+
+
+def _unquote(text):
+    return text[1:-1] if text[:1] in "\"`[" else text
+
+
+def approximate_sql(sql, sample_table):
+    """Rewrite a query on netflix to run on a sample table with scaled COUNT(*)
+
+    Only bare `netflix` identifiers are replaced, never text inside string
+    literals, quoted identifiers or comments. COUNT(*) becomes a scaled
+    estimate anywhere in the query. Standalone COUNT(*) items of the
+    outermost select list also get a 95% confidence half-width column:
+    `name_ci95` after `COUNT(*) AS name`, or `ci95` when unaliased. Raises
+    ValueError for queries that cannot be scaled this way (joins, CTEs,
+    compound or window queries, subqueries in FROM, COUNT(expr), SUM).
+    AVG, MIN and MAX are computed on the sample rows as they are.
+    """
+    tokens = _tokenize_sql(sql)
+    significant = [i for i, (kind, _) in enumerate(tokens) if kind not in ("space", "comment")]
+
+    def text(j):
+        return tokens[significant[j]][1].upper() if j < len(significant) else ""
+
+    def kind(j):
+        return tokens[significant[j]][0] if j < len(significant) else None
+
+    reads_table = False
+    depth = 0
+    outer_select_list = False
+    for j, i in enumerate(significant):
+        token_kind, token = tokens[i]
+        word = token.upper()
+
+        if token == ";" and j + 1 < len(significant):
+            raise ValueError("run one statement at a time")
+        if token == "(":
+            depth += 1
+            continue
+        if token == ")":
+            depth -= 1
+            continue
+        if token_kind == "quoted" and _unquote(token).lower() == "netflix":
+            raise ValueError("write the table name as plain netflix, not quoted")
+        if token_kind != "word":
+            continue
+
+        if word in UNSUPPORTED_WORDS:
+            raise ValueError(f"approximate mode does not support {UNSUPPORTED_WORDS[word]}")
+        if word == "FROM" and text(j + 1) == "(":
+            raise ValueError("approximate mode does not support subqueries in FROM")
+        if word in UNSCALED_AGGREGATES and text(j + 1) == "(":
+            raise ValueError(f"{word}() cannot be scaled from a sample")
+        if word == "SELECT" and depth == 0:
+            outer_select_list = True
+        elif word == "FROM" and depth == 0:
+            outer_select_list = False
+
+        if word == "NETFLIX":
+            tokens[i][1] = sample_table
+            reads_table = True
+        elif word == "COUNT" and text(j + 1) == "(":
+            if text(j + 2) != "*" or text(j + 3) != ")":
+                raise ValueError("only COUNT(*) can be scaled from a sample")
+            tokens[i][1] = "approx_count(stratum)"
+            for k in range(j + 1, j + 4):
+                tokens[significant[k]][1] = ""
+            if not (depth == 0 and outer_select_list and text(j - 1) in ("SELECT", ",", "DISTINCT", "ALL")):
+                continue
+            # Standalone select item: add its confidence half-width column
+            following = j + 4
+            if text(following) == "AS" and kind(following + 1) in ("word", "quoted"):
+                following += 1
+            if kind(following) in ("word", "quoted") and text(following) not in _CLAUSE_WORDS:
+                alias = _unquote(tokens[significant[following]][1])
+                tokens[significant[following]][1] += f", approx_margin(stratum) AS \"{alias}_ci95\""
+            elif text(following) in ("", ",", "FROM", ";"):
+                tokens[i][1] += ", approx_margin(stratum) AS ci95"
+
+    if not reads_table:
+        raise ValueError("approximate mode only rewrites queries that read netflix")
+    return "".join(token for _, token in tokens)
+
+
+def main():
+    script_dir = Path(__file__).parent
+    db_path = script_dir / "netflix.db"
+
+    if not db_path.exists():
+        print(f"✗ Database not found: {db_path}")
+        print("Please run: python setup_sqlite.py")
+        sys.exit(1)
+
+    conn = connect(str(db_path))
+    if "--build" in sys.argv[1:] or not available_samples(conn):
+        sizes = build_samples(conn)
+        print(f"✓ Built {', '.join(f'{name} ({rows} rows)' for name, rows in sizes.items())}")
+
+    sql = "SELECT type, COUNT(*) AS titles FROM netflix WHERE listed_in LIKE '%Dramas%' GROUP BY type"
+    start = time.perf_counter()
+    exact = dict(conn.execute(sql).fetchall())
+    exact_ms = (time.perf_counter() - start) * 1000
+    print(f"\nExact ({exact_ms:.2f} ms): {exact}")
+
+    for name, (population, sampled) in available_samples(conn).items():
+        register_sample_aggregates(conn, name)
+        start = time.perf_counter()
+        rows = conn.execute(approximate_sql(sql, name)).fetchall()
+        elapsed = (time.perf_counter() - start) * 1000
+        estimates = ", ".join(f"{type_}: {titles} ± {margin}" for type_, titles, margin in rows)
+        print(f"{name} ({sampled} of {population} rows, {elapsed:.2f} ms): {estimates}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -11,10 +11,14 @@ import os
 import sys
 from pathlib import Path
 
+from compressed_input import open_catalog
+from ingest_profiler import IngestProfiler, NullProfiler
+from sql_functions import EXPRESSION_INDEXES, connect, create_expression_indexes
+
 def create_connection(db_path):
     """Create a SQLite database connection"""
     try:
-        conn = sqlite3.connect(db_path)
+        conn = connect(db_path)
         print(f"✓ Connected to database: {db_path}")
         return conn
     except sqlite3.Error as e:
@@ -51,15 +55,19 @@ def create_table(conn):
         print(f"✗ Error creating table: {e}")
         sys.exit(1)
 
-def import_csv_data(conn, csv_path):
-    """Import CSV data into the netflix table"""
-    if not os.path.exists(csv_path):
+def import_csv_data(conn, csv_path, profiler=None):
+    """Import CSV data into the netflix table and return the number of rows
+
+    csv_path may be a plain, gzip, bz2 or xz compressed file, or '-' for stdin.
+    """
+    if csv_path != "-" and not os.path.exists(csv_path):
         print(f"✗ CSV file not found: {csv_path}")
         sys.exit(1)
     
+    profiler = profiler or NullProfiler()
     try:
         cursor = conn.cursor()
-        with open(csv_path, 'r', encoding='utf-8') as f:
+        with open_catalog(csv_path) as (f, input_stats):
             csv_reader = csv.reader(f)
             headers = next(csv_reader)  # Skip header
             
@@ -69,15 +77,80 @@ def import_csv_data(conn, csv_path):
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """
             
-            rows = list(csv_reader)
-            cursor.executemany(insert_sql, rows)
-            conn.commit()
+            with profiler.stage("import_csv_data.parse") as stage:
+                rows = list(csv_reader)
+                input_stats.finish()
+                stage.rows = len(rows)
+            # SQLite applies column affinity (e.g. release_year -> INTEGER) during the insert
+            with profiler.stage("import_csv_data.insert") as stage:
+                cursor.executemany(insert_sql, rows)
+                stage.rows = len(rows)
+            with profiler.stage("import_csv_data.commit"):
+                conn.commit()
             
             print(f"✓ Imported {len(rows)} records from CSV")
+            print(f"✓ Input {input_stats.summary()}")
+            return len(rows)
     except Exception as e:
         print(f"✗ Error importing CSV: {e}")
         sys.exit(1)
 
+def build_time_index(conn):
+    """Build and persist the date_added prefix-sum time index"""
+    from time_index import TimeIndex, INDEX_TABLE
+
+    try:
+        index = TimeIndex.from_connection(conn)
+        rows = index.save(conn)
+        print(f"✓ Time index saved to '{INDEX_TABLE}' ({len(index.series)} series, {rows} rows)")
+    except sqlite3.Error as e:
+        print(f"✗ Error building time index: {e}")
+        sys.exit(1)
+
+def build_browse_index(conn):
+    """Create the (release_year, show_id) index used for keyset browsing"""
+    from keyset_browse import BROWSE_INDEX, ensure_browse_index
+
+    try:
+        table = ensure_browse_index(conn)
+        print(f"✓ Index '{BROWSE_INDEX}' created on '{table}'")
+    except sqlite3.Error as e:
+        print(f"✗ Error creating browse index: {e}")
+        sys.exit(1)
+
+def build_expression_indexes(conn):
+    """Create indexes on duration_value, first_genre and content_category"""
+    try:
+        table = create_expression_indexes(conn)
+        print(f"✓ {len(EXPRESSION_INDEXES)} expression indexes created on '{table}'")
+    except sqlite3.Error as e:
+        print(f"✗ Error creating expression indexes: {e}")
+        sys.exit(1)
+
+def build_bitmap_index(conn):
+    """Build and persist the type/rating/genre/country/year bitmap index"""
+    from bitmap_index import BitmapIndex, BITMAP_TABLE
+
+    try:
+        index = BitmapIndex.from_connection(conn)
+        bitmaps = index.save(conn)
+        print(f"✓ Bitmap index saved to '{BITMAP_TABLE}' ({bitmaps} bitmaps)")
+    except sqlite3.Error as e:
+        print(f"✗ Error building bitmap index: {e}")
+        sys.exit(1)
+
+def build_sample_tables(conn):
+    """Build the stratified sample tables used by approximate queries"""
+    from sample_tables import build_samples
+
+    try:
+        sizes = build_samples(conn)
+        for name, rows in sizes.items():
+            print(f"✓ Sample '{name}' created ({rows} rows)")
+    except sqlite3.Error as e:
+        print(f"✗ Error building sample tables: {e}")
+        sys.exit(1)
+
 def verify_data(conn):
     """Verify the data was imported correctly"""
     try:
@@ -102,31 +175,107 @@ def main():
     
     script_dir = Path(__file__).parent
     db_path = script_dir / "netflix.db"
-    csv_path = script_dir / "netflix_titles.csv"
+    args = sys.argv[1:]
+    # --csv accepts a plain or gzip/bz2/xz compressed dump, or '-' for stdin
+    csv_path = args[args.index("--csv") + 1] if "--csv" in args else script_dir / "netflix_titles.csv"
+    compact = "--compact" in args
+    profile_path = None
+    if "--profile" in args:
+        position = args.index("--profile") + 1
+        has_path = position < len(args) and not args[position].startswith("--")
+        profile_path = Path(args[position]) if has_path else script_dir / "ingest_profile.json"
     
     print(f"Project directory: {script_dir}")
     print(f"Database path: {db_path}")
     print(f"CSV path: {csv_path}\n")
     
+    # Check the dump before the existing database is thrown away
+    if str(csv_path) != "-" and not os.path.exists(csv_path):
+        print(f"✗ CSV file not found: {csv_path}")
+        sys.exit(1)
+    
     # Remove existing database if it exists
     if db_path.exists():
         db_path.unlink()
         print("⊘ Existing database removed\n")
     
+    profiler = IngestProfiler() if profile_path else NullProfiler()
+    if profile_path:
+        profiler.start()
+    
     # Create connection
     conn = create_connection(str(db_path))
     
-    # Create table
-    print("\nStep 1: Creating table schema...")
-    create_table(conn)
+    if compact:
+        # Dictionary-encoded layout behind a compatibility view named netflix
+        from compact_storage import create_compact_schema, import_compact
+        from shared_scan import iter_csv_rows
+
+        print("\nStep 1: Creating compact table schema...")
+        with profiler.stage("create_table"):
+            create_compact_schema(conn)
+        print("✓ Compact tables and 'netflix' view created successfully")
+
+        print("\nStep 2: Importing CSV data...")
+        input_stats = []
+        try:
+            with profiler.stage("import_csv_data") as stage:
+                count = import_compact(conn, iter_csv_rows(str(csv_path), input_stats))
+                stage.rows = count
+        except Exception as e:
+            print(f"✗ Error importing CSV: {e}")
+            sys.exit(1)
+        print(f"✓ Imported {count} records from CSV")
+        # Rows are streamed into the inserts, so this includes their time too
+        print(f"✓ Input {input_stats[0].summary()}")
+    else:
+        # Create table
+        print("\nStep 1: Creating table schema...")
+        with profiler.stage("create_table"):
+            create_table(conn)
+
+        # Import data
+        print("\nStep 2: Importing CSV data...")
+        with profiler.stage("import_csv_data") as stage:
+            count = import_csv_data(conn, str(csv_path), profiler)
+            stage.rows = count
     
-    # Import data
-    print("\nStep 2: Importing CSV data...")
-    import_csv_data(conn, str(csv_path))
+    # Time index
+    print("\nStep 3: Building date_added time index...")
+    with profiler.stage("build_time_index") as stage:
+        build_time_index(conn)
+        stage.rows = count
+    
+    # Indexes
+    print("\nStep 4: Creating indexes...")
+    with profiler.stage("build_browse_index"):
+        build_browse_index(conn)
+    with profiler.stage("build_expression_indexes"):
+        build_expression_indexes(conn)
+    with profiler.stage("build_bitmap_index") as stage:
+        build_bitmap_index(conn)
+        stage.rows = count
+    
+    # Samples
+    print("\nStep 5: Building stratified samples...")
+    with profiler.stage("build_sample_tables") as stage:
+        build_sample_tables(conn)
+        stage.rows = count
     
     # Verify
-    print("\nStep 3: Verifying import...")
-    if verify_data(conn):
+    print("\nStep 6: Verifying import...")
+    with profiler.stage("verify_data") as stage:
+        verified = verify_data(conn)
+        stage.rows = count
+    
+    if profile_path:
+        profiler.stop()
+        profiler.write(profile_path)
+        print("\nIngest profile:")
+        profiler.print_summary()
+        print(f"✓ Profile written to: {profile_path}")
+    
+    if verified:
         print("\n" + "="*60)
         print("✓ Setup Complete! Database ready for analysis")
         print("="*60)
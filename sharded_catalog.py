@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Netflix SQL Project - Sharded Catalog
+Partitions the netflix table across several SQLite files and answers
+catalog queries by fanning out to the shards in parallel worker processes
+"""
+
+import json
+import sys
+import time
+import zlib
+from bisect import bisect_right
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+
+from setup_sqlite import create_table
+from shared_scan import COLUMNS, RELEASE_YEAR, SHOW_ID, iter_csv_rows
+from sql_functions import connect
+
+MANIFEST_NAME = "manifest.json"
+INSERT_SQL = f"""
+INSERT INTO netflix ({', '.join(COLUMNS)})
+VALUES ({', '.join('?' for _ in COLUMNS)})
+"""
+
+# Per-shard SQL plus how the partial results are merged:
+#   group_by    - column positions identifying a group across shards
+#   sum_columns - column positions summed when groups from several shards meet
+#   percent_of  - column positions whose share of the column total (as a
+#                 rounded percentage) is appended to every merged row
+#   top_per_group - (partition positions, rank position, n): keep the rows
+#                 ranked n or better by the rank column, descending, within
+#                 each partition, with ties sharing a rank as in RANK()
+#   order_by    - (column position, descending) pairs re-applied after merging
+#   limit       - LIMIT re-applied after merging
+#   keep_columns - column positions returned, dropping helper columns such as sort keys
+# Top-N queries must not LIMIT per shard when they aggregate, otherwise a
+# group that is small on every shard but large overall would be lost.
+SHARDED_QUERIES = {
+    1: {
+        "title": "Count the number of Movies vs TV Shows",
+        "sql": "SELECT type, COUNT(*) AS count FROM netflix GROUP BY type",
+        "merge": {"group_by": [0], "sum_columns": [1], "order_by": [(1, True)], "limit": None},
+    },
+    2: {
+        "title": "Find the most common rating for movies and TV shows",
+        "sql": """
+        SELECT type, rating AS most_frequent_rating, COUNT(*) AS rating_count
+        FROM netflix
+        GROUP BY type, rating
+        """,
+        "merge": {"group_by": [0, 1], "sum_columns": [2], "top_per_group": ([0], 2, 1),
+                  "order_by": [(0, False)], "limit": None},
+    },
+    4: {
+        "title": "Find the top 5 countries with the most content on Netflix",
+        # Same shape as the single-database query, whose cross join with a two-row
+        # subquery counts every title twice; shared_scan reproduces that as well
+        "sql": """
+        SELECT country, COUNT(*) AS total_content
+        FROM (
+            SELECT TRIM(country) AS country
+            FROM netflix, (SELECT '' UNION SELECT ',')
+            WHERE country != '' AND country IS NOT NULL
+        )
+        WHERE country != ''
+        GROUP BY country
+        """,
+        "merge": {"group_by": [0], "sum_columns": [1], "order_by": [(1, True)], "limit": 5},
+    },
+    5: {
+        "title": "Identify the longest movie",
+        "sql": """
+        SELECT title, type, duration, release_year,
+               duration_value(duration) AS minutes
+        FROM netflix
+        WHERE type = 'Movie'
+        ORDER BY minutes DESC
+        LIMIT 1
+        """,
+        "merge": {"group_by": None, "sum_columns": [], "order_by": [(4, True)], "limit": 1,
+                  "keep_columns": [0, 1, 2, 3]},
+    },
+    6: {
+        "title": "Find content added in the last 5 years",
+        "sql": """
+        SELECT title, type, date_added, release_year
+        FROM netflix
+        WHERE date_added IS NOT NULL AND date_added != ''
+        ORDER BY date_added DESC
+        LIMIT 20
+        """,
+        "merge": {"group_by": None, "sum_columns": [], "order_by": [(2, True)], "limit": 20},
+    },
+    9: {
+        "title": "Count the number of content items in each genre",
+        "sql": """
+        SELECT first_genre(listed_in) AS genre,
+               COUNT(*) AS total_content
+        FROM netflix
+        WHERE listed_in IS NOT NULL
+        GROUP BY genre
+        HAVING genre != ''
+        """,
+        "merge": {"group_by": [0], "sum_columns": [1], "order_by": [(1, True)], "limit": 20},
+    },
+    10: {
+        "title": "Find each year and the average numbers of content release in India. Return top 5 years with highest avg content release!",
+        "sql": """
+        SELECT release_year, COUNT(*) AS total_release
+        FROM netflix
+        WHERE country LIKE '%India%'
+        GROUP BY release_year
+        """,
+        "merge": {"group_by": [0], "sum_columns": [1], "percent_of": [1],
+                  "order_by": [(2, True)], "limit": 5},
+    },
+    12: {
+        "title": "Find all content without a director",
+        "sql": """
+        SELECT show_id, title, type, release_year, rating
+        FROM netflix
+        WHERE director IS NULL OR director = ''
+        ORDER BY show_id
+        LIMIT 20
+        """,
+        "merge": {"group_by": None, "sum_columns": [], "order_by": [(0, False)], "limit": 20},
+    },
+}
+
+
+def shard_by_hash(show_id, num_shards):
+    """Stable shard number for a show_id"""
+    return zlib.crc32(str(show_id).encode('utf-8')) % num_shards
+
+
+def shard_by_year(release_year, year_bounds):
+    """Shard number for a release_year given ascending upper-exclusive bounds"""
+    if not isinstance(release_year, int):
+        return 0
+    return bisect_right(year_bounds, release_year)
+
+
+def year_bounds_for(csv_path, num_shards):
+    """Pick release_year bounds that split the catalog into roughly equal shards"""
+    years = sorted(row[RELEASE_YEAR] for row in iter_csv_rows(csv_path)
+                   if isinstance(row[RELEASE_YEAR], int))
+    if not years:
+        return []
+    bounds = []
+    for i in range(1, num_shards):
+        bound = years[len(years) * i // num_shards]
+        if not bounds or bound > bounds[-1]:
+            bounds.append(bound)
+    return bounds
+
+
+def load_manifest(shard_dir):
+    """Read the shard manifest written by build_shards"""
+    manifest_path = Path(shard_dir) / MANIFEST_NAME
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    manifest["shards"] = [str(Path(shard_dir) / name) for name in manifest["shards"]]
+    return manifest
+
+
+def build_shards(csv_path, shard_dir, num_shards=4, scheme="hash", batch_size=5000):
+    """Route CSV rows into num_shards SQLite files and write a manifest"""
+    shard_dir = Path(shard_dir)
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    if scheme == "year":
+        year_bounds = year_bounds_for(csv_path, num_shards)
+        num_shards = len(year_bounds) + 1
+        route = lambda row: shard_by_year(row[RELEASE_YEAR], year_bounds)
+    elif scheme == "hash":
+        year_bounds = None
+        route = lambda row: shard_by_hash(row[SHOW_ID], num_shards)
+    else:
+        raise ValueError(f"Unknown sharding scheme: {scheme}")
+
+    names = [f"netflix_shard_{i}.db" for i in range(num_shards)]
+    conns = []
+    for name in names:
+        path = shard_dir / name
+        if path.exists():
+            path.unlink()
+        conn = connect(str(path))
+        create_table(conn)
+        conns.append(conn)
+
+    pending = [[] for _ in range(num_shards)]
+    counts = [0] * num_shards
+    for row in iter_csv_rows(csv_path):
+        shard = route(row)
+        pending[shard].append(row)
+        if len(pending[shard]) >= batch_size:
+            conns[shard].executemany(INSERT_SQL, pending[shard])
+            counts[shard] += len(pending[shard])
+            pending[shard] = []
+
+    for shard, conn in enumerate(conns):
+        if pending[shard]:
+            conn.executemany(INSERT_SQL, pending[shard])
+            counts[shard] += len(pending[shard])
+        conn.commit()
+        conn.close()
+
+    manifest = {"scheme": scheme, "year_bounds": year_bounds, "shards": names, "rows": counts}
+    with open(shard_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    return counts
+
+
+def _query_shard(args):
+    """Worker: run one SQL statement against one shard file"""
+    shard_path, sql, params = args
+    conn = connect(f"file:{shard_path}?mode=ro", uri=True)
+    try:
+        return [tuple(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+def merge_results(partials, group_by=None, sum_columns=(), percent_of=(), top_per_group=None,
+                  order_by=(), limit=None, keep_columns=None):
+    """Merge per-shard result lists into one result"""
+    if group_by is None:
+        rows = [row for partial in partials for row in partial]
+    else:
+        groups = {}
+        for partial in partials:
+            for row in partial:
+                key = tuple(row[i] for i in group_by)
+                if key not in groups:
+                    groups[key] = list(row)
+                    continue
+                merged = groups[key]
+                for i in sum_columns:
+                    merged[i] += row[i]
+        rows = [tuple(row) for row in groups.values()]
+
+    # Shares need the merged total, which no single shard knows
+    if percent_of:
+        totals = [sum(row[i] for row in rows if row[i] is not None) for i in percent_of]
+        rows = [row + tuple(round(100.0 * row[i] / total, 2) if total and row[i] is not None else None
+                            for i, total in zip(percent_of, totals))
+                for row in rows]
+
+    if top_per_group is not None:
+        partition, rank_column, n = top_per_group
+        rank_key = lambda row: (row[rank_column] is not None, row[rank_column])  # NULLs rank last
+        values = {}
+        for row in rows:
+            values.setdefault(tuple(row[i] for i in partition), []).append(rank_key(row))
+        # A row ranks n or better when fewer than n rows of its partition beat it
+        cutoffs = {key: sorted(ranked, reverse=True)[min(n, len(ranked)) - 1] for key, ranked in values.items()}
+        rows = [row for row in rows if rank_key(row) >= cutoffs[tuple(row[i] for i in partition)]]
+
+    # Apply ORDER BY keys from last to first; each sort is stable
+    for position, descending in reversed(list(order_by)):
+        rows.sort(key=lambda row: (row[position] is not None, row[position]), reverse=descending)
+
+    rows = rows[:limit] if limit else rows
+    if keep_columns is not None:
+        rows = [tuple(row[i] for i in keep_columns) for row in rows]
+    return rows
+
+
+def fanout_query(shard_paths, sql, params=(), merge=None, pool=None):
+    """Run sql on every shard in parallel worker processes and merge the partials"""
+    tasks = [(path, sql, params) for path in shard_paths]
+    if pool is None:
+        with Pool(min(len(tasks), cpu_count())) as own_pool:
+            partials = own_pool.map(_query_shard, tasks)
+    else:
+        partials = pool.map(_query_shard, tasks)
+    return merge_results(partials, **(merge or {}))
+
+
+def run_sharded_queries(shard_dir):
+    """Execute every sharded business query and print the merged results"""
+    from run_all_queries import print_results
+
+    manifest = load_manifest(shard_dir)
+    if manifest is None:
+        print(f"✗ No shard manifest found in: {shard_dir}")
+        print("Please run: python sharded_catalog.py build")
+        return
+
+    shards = manifest["shards"]
+    print(f"\nShards: {len(shards)} ({manifest['scheme']}), rows per shard: {manifest['rows']}\n")
+
+    with Pool(min(len(shards), cpu_count())) as pool:
+        for query_num, query_info in sorted(SHARDED_QUERIES.items()):
+            start = time.perf_counter()
+            results = fanout_query(shards, query_info["sql"], merge=query_info["merge"], pool=pool)
+            elapsed = time.perf_counter() - start
+            print(f"Query {query_num}: {query_info['title']} ({elapsed * 1000:.1f} ms)")
+            print("-" * 80)
+            print_results(results)
+
+
+def main():
+    script_dir = Path(__file__).parent
+    csv_path = script_dir / "netflix_titles.csv"
+    shard_dir = script_dir / "shards"
+
+    args = sys.argv[1:]
+    command = args[0] if args else "query"
+
+    print("\n" + "="*80)
+    print("NETFLIX SQL PROJECT - SHARDED CATALOG")
+    print("="*80)
+
+    if command == "build":
+        num_shards = int(args[args.index("--shards") + 1]) if "--shards" in args else cpu_count()
+        scheme = args[args.index("--scheme") + 1] if "--scheme" in args else "hash"
+        counts = build_shards(str(csv_path), shard_dir, num_shards, scheme)
+        print(f"\n✓ Routed {sum(counts)} records into {len(counts)} shards: {counts}")
+        print(f"✓ Shards written to: {shard_dir}\n")
+    elif command == "query":
+        run_sharded_queries(shard_dir)
+    else:
+        print("Usage: python sharded_catalog.py [build [--shards N] [--scheme hash|year] | query]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+Netflix SQL Project - Shared-Scan Executor
+Answers all 15 business problems in a single pass over the netflix rows
+"""
+
+import csv
+import heapq
+import re
+import string
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from compressed_input import open_catalog
+from run_queries import QUERIES
+from run_all_queries import print_results
+from sql_functions import connect, duration_value
+
+COLUMNS = (
+    "show_id", "type", "title", "director", "casts", "country",
+    "date_added", "release_year", "rating", "duration", "listed_in", "description",
+)
+
+(SHOW_ID, TYPE, TITLE, DIRECTOR, CASTS, COUNTRY,
+ DATE_ADDED, RELEASE_YEAR, RATING, DURATION, LISTED_IN, DESCRIPTION) = range(len(COLUMNS))
+
+# SQLite's LIKE is case-insensitive for ASCII letters only
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def like_contains(value, needle):
+    """Python equivalent of SQLite's `value LIKE '%needle%'`"""
+    if value is None:
+        return False
+    return needle.translate(_ASCII_LOWER) in str(value).translate(_ASCII_LOWER)
+
+
+def split_multi(value):
+    """Split a comma-separated multi-valued field (casts, director, country, listed_in)"""
+    if not value:
+        return []
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def _coerce_year(value):
+    """Apply SQLite INTEGER affinity to a release_year value read from CSV"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def iter_csv_rows(csv_path, stats=None):
+    """Yield netflix rows from the CSV (plain or compressed, '-' for stdin) as tuples in COLUMNS order
+
+    If stats is a list, the InputStats of the opened dump is appended to it
+    and finished once the last row has been read.
+    """
+    with open_catalog(csv_path) as (f, input_stats):
+        if stats is not None:
+            stats.append(input_stats)
+        csv_reader = csv.reader(f)
+        next(csv_reader)  # Skip header
+        for row in csv_reader:
+            row[RELEASE_YEAR] = _coerce_year(row[RELEASE_YEAR])
+            yield tuple(row)
+        input_stats.finish()
+
+
+def iter_cursor_rows(conn, table="netflix", batch_size=1000):
+    """Yield netflix rows from a database connection as tuples in COLUMNS order"""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {', '.join(COLUMNS)} FROM {table}")
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        for row in batch:
+            yield tuple(row)
+
+
+def _ordered_counts(counts, limit=None):
+    """GROUP BY key ORDER BY count DESC [LIMIT n], ties kept in key order"""
+    groups = sorted(counts.items(), key=lambda item: item[0])
+    groups.sort(key=lambda item: item[1], reverse=True)
+    return groups[:limit] if limit else groups
+
+
+class _TopK:
+    """Bounded ORDER BY key DESC LIMIT k; ties resolved in scan order"""
+
+    def __init__(self, k):
+        self.k = k
+        self.heap = []
+        self.seq = 0
+
+    def push(self, key, row):
+        entry = (key, -self.seq, row)
+        self.seq += 1
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, entry)
+        elif entry[:2] > self.heap[0][:2]:
+            heapq.heapreplace(self.heap, entry)
+
+    def result(self):
+        return [entry[2] for entry in sorted(self.heap, key=lambda e: e[:2], reverse=True)]
+
+
+class Aggregator:
+    """Base class for a business query answered by feeding it every row once"""
+
+    query_num = None
+    columns = ()
+    # Result columns the SQL orders by before its LIMIT; () when it limits
+    # unordered rows, None when it has no LIMIT
+    tie_columns = None
+
+    def feed(self, row):
+        raise NotImplementedError
+
+    def result(self):
+        raise NotImplementedError
+
+
+class TypeCounts(Aggregator):
+    query_num = 1
+    columns = ("type", "count")
+
+    def __init__(self):
+        self.counts = {}
+
+    def feed(self, row):
+        self.counts[row[TYPE]] = self.counts.get(row[TYPE], 0) + 1
+
+    def result(self):
+        return _ordered_counts(self.counts)
+
+
+class TopRatingPerType(Aggregator):
+    query_num = 2
+    columns = ("type", "most_frequent_rating", "rating_count")
+
+    def __init__(self):
+        self.counts = {}
+
+    def feed(self, row):
+        key = (row[TYPE], row[RATING])
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def result(self):
+        best = {}
+        for (type_, _), count in self.counts.items():
+            best[type_] = max(best.get(type_, 0), count)
+        return [(type_, rating, count)
+                for (type_, rating), count in sorted(self.counts.items())
+                if count == best[type_]]
+
+
+class MoviesFromYear(Aggregator):
+    query_num = 3
+    columns = ("show_id", "title", "type", "release_year", "rating", "duration")
+    tie_columns = ()
+
+    def __init__(self, year=2020, limit=10):
+        self.year = year
+        self.limit = limit
+        self.rows = []
+
+    def feed(self, row):
+        if len(self.rows) < self.limit and row[RELEASE_YEAR] == self.year and row[TYPE] == 'Movie':
+            self.rows.append((row[SHOW_ID], row[TITLE], row[TYPE],
+                              row[RELEASE_YEAR], row[RATING], row[DURATION]))
+
+    def result(self):
+        return self.rows
+
+
+class TopCountries(Aggregator):
+    query_num = 4
+    columns = ("country", "total_content")
+    tie_columns = ("total_content",)
+
+    def __init__(self, limit=5):
+        self.limit = limit
+        self.counts = {}
+
+    def feed(self, row):
+        country = row[COUNTRY]
+        if country:
+            country = country.strip()
+            if country:
+                self.counts[country] = self.counts.get(country, 0) + 1
+
+    def result(self):
+        # The SQL path cross joins a two-row subquery, so every row is counted twice
+        doubled = {country: 2 * count for country, count in self.counts.items()}
+        return _ordered_counts(doubled, self.limit)
+
+
+class LongestMovie(Aggregator):
+    query_num = 5
+    columns = ("title", "type", "duration", "release_year")
+    tie_columns = ("duration",)
+
+    def __init__(self):
+        self.top = _TopK(1)
+
+    def feed(self, row):
+        # NULL durations sort last under ORDER BY ... DESC, so they never make the cut
+        minutes = duration_value(row[DURATION])
+        if row[TYPE] == 'Movie' and minutes is not None:
+            self.top.push(minutes, (row[TITLE], row[TYPE], row[DURATION], row[RELEASE_YEAR]))
+
+    def result(self):
+        return self.top.result()
+
+
+class RecentlyAdded(Aggregator):
+    query_num = 6
+    columns = ("title", "type", "date_added", "release_year")
+    tie_columns = ("date_added",)
+
+    def __init__(self, limit=20):
+        self.top = _TopK(limit)
+
+    def feed(self, row):
+        if row[DATE_ADDED]:
+            self.top.push(row[DATE_ADDED],
+                          (row[TITLE], row[TYPE], row[DATE_ADDED], row[RELEASE_YEAR]))
+
+    def result(self):
+        return self.top.result()
+
+
+class ByDirector(Aggregator):
+    query_num = 7
+    columns = ("title", "type", "director", "release_year")
+    tie_columns = ()
+
+    def __init__(self, director='Rajiv Chilaka', limit=20):
+        self.director = director
+        self.limit = limit
+        self.rows = []
+
+    def feed(self, row):
+        if len(self.rows) < self.limit and like_contains(row[DIRECTOR], self.director):
+            self.rows.append((row[TITLE], row[TYPE], row[DIRECTOR], row[RELEASE_YEAR]))
+
+    def result(self):
+        return self.rows
+
+
+class LongRunningShows(Aggregator):
+    query_num = 8
+    columns = ("title", "type", "duration", "release_year")
+    tie_columns = ("duration",)
+
+    def __init__(self, min_seasons=5, limit=20):
+        self.min_seasons = min_seasons
+        self.top = _TopK(limit)
+
+    def feed(self, row):
+        if row[TYPE] == 'TV Show':
+            seasons = duration_value(row[DURATION])
+            if seasons is not None and seasons > self.min_seasons:
+                self.top.push(seasons, (row[TITLE], row[TYPE], row[DURATION], row[RELEASE_YEAR]))
+
+    def result(self):
+        return self.top.result()
+
+
+class GenreCounts(Aggregator):
+    query_num = 9
+    columns = ("genre", "total_content")
+    tie_columns = ("total_content",)
+
+    def __init__(self, limit=20):
+        self.limit = limit
+        self.counts = {}
+
+    def feed(self, row):
+        listed_in = row[LISTED_IN]
+        if listed_in is None:
+            return
+        genre = listed_in.split(',', 1)[0].strip()
+        if genre:
+            self.counts[genre] = self.counts.get(genre, 0) + 1
+
+    def result(self):
+        return _ordered_counts(self.counts, self.limit)
+
+
+class IndiaYearlyReleases(Aggregator):
+    query_num = 10
+    columns = ("release_year", "total_release", "avg_release_percent")
+    tie_columns = ("avg_release_percent",)
+
+    def __init__(self, limit=5):
+        self.limit = limit
+        self.counts = {}
+
+    def feed(self, row):
+        if like_contains(row[COUNTRY], 'India'):
+            year = row[RELEASE_YEAR]
+            self.counts[year] = self.counts.get(year, 0) + 1
+
+    def result(self):
+        total = sum(self.counts.values())
+        return [(year, count, round(100.0 * count / total, 2))
+                for year, count in _ordered_counts(self.counts, self.limit)]
+
+
+class Documentaries(Aggregator):
+    query_num = 11
+    columns = ("title", "type", "listed_in", "release_year")
+    tie_columns = ()
+
+    def __init__(self, limit=20):
+        self.limit = limit
+        self.rows = []
+
+    def feed(self, row):
+        if len(self.rows) < self.limit and like_contains(row[LISTED_IN], 'Documentaries'):
+            self.rows.append((row[TITLE], row[TYPE], row[LISTED_IN], row[RELEASE_YEAR]))
+
+    def result(self):
+        return self.rows
+
+
+class Directorless(Aggregator):
+    query_num = 12
+    columns = ("title", "type", "release_year", "rating")
+    tie_columns = ()
+
+    def __init__(self, limit=20):
+        self.limit = limit
+        self.rows = []
+
+    def feed(self, row):
+        if len(self.rows) < self.limit and not row[DIRECTOR]:
+            self.rows.append((row[TITLE], row[TYPE], row[RELEASE_YEAR], row[RATING]))
+
+    def result(self):
+        return self.rows
+
+
+class ActorAppearances(Aggregator):
+    query_num = 13
+    columns = ("title", "type", "casts", "release_year")
+    tie_columns = ("release_year",)
+
+    def __init__(self, actor='Salman Khan', years=10, limit=20):
+        self.actor = actor
+        self.years = years
+        self.limit = limit
+        self.max_year = None
+        self.candidates = []
+
+    def feed(self, row):
+        year = row[RELEASE_YEAR]
+        if isinstance(year, int) and (self.max_year is None or year > self.max_year):
+            self.max_year = year
+        if like_contains(row[CASTS], self.actor):
+            self.candidates.append((row[TITLE], row[TYPE], row[CASTS], year))
+
+    def result(self):
+        if self.max_year is None:
+            return []
+        cutoff = self.max_year - self.years
+        rows = [r for r in self.candidates if isinstance(r[3], int) and r[3] >= cutoff]
+        rows.sort(key=lambda r: r[3], reverse=True)
+        return rows[:self.limit]
+
+
+class IndianActors(Aggregator):
+    query_num = 14
+    columns = ("actor", "appearances")
+    tie_columns = ("appearances",)
+
+    def __init__(self, limit=10):
+        self.limit = limit
+        self.india_rows = 0
+        self.counts = {}
+
+    def feed(self, row):
+        if not like_contains(row[COUNTRY], 'India'):
+            return
+        self.india_rows += 1
+        for actor in split_multi(row[CASTS]):
+            self.counts[actor] = self.counts.get(actor, 0) + 1
+
+    def result(self):
+        # The SQL path joins every Indian row against the split actor list
+        scaled = {actor: count * self.india_rows for actor, count in self.counts.items()}
+        return _ordered_counts(scaled, self.limit)
+
+
+class KeywordCategories(Aggregator):
+    query_num = 15
+    columns = ("category", "content_count")
+
+    def __init__(self):
+        self.counts = {}
+
+    def feed(self, row):
+        description = row[DESCRIPTION]
+        bad = like_contains(description, 'kill') or like_contains(description, 'violence')
+        category = 'Bad' if bad else 'Good'
+        self.counts[category] = self.counts.get(category, 0) + 1
+
+    def result(self):
+        return _ordered_counts(self.counts)
+
+
+AGGREGATORS = {
+    cls.query_num: cls
+    for cls in (TypeCounts, TopRatingPerType, MoviesFromYear, TopCountries, LongestMovie,
+                RecentlyAdded, ByDirector, LongRunningShows, GenreCounts, IndiaYearlyReleases,
+                Documentaries, Directorless, ActorAppearances, IndianActors, KeywordCategories)
+}
+
+
+def run_shared_scan(rows, aggregators=None):
+    """Feed every row to every aggregator in a single pass
+
+    Returns {query_num: (columns, result_rows)}.
+    """
+    if aggregators is None:
+        aggregators = [cls() for cls in AGGREGATORS.values()]
+    feeds = [agg.feed for agg in aggregators]
+
+    for row in rows:
+        for feed in feeds:
+            feed(row)
+
+    return {agg.query_num: (agg.columns, agg.result()) for agg in aggregators}
+
+
+_LIMIT_RE = re.compile(r"\s*\bLIMIT\s+\d+\s*;?\s*$", re.IGNORECASE)
+
+
+def _tie_only(columns, rows, expected, unlimited, tie_columns):
+    """True if rows is another valid answer to a LIMIT that cuts through ties
+
+    Every row must be in the unlimited SQL result, and the rows must carry
+    the same ORDER BY values as the rows the SQL path kept.
+    """
+    if tie_columns is None or len(rows) != len(expected):
+        return False
+    available = Counter(unlimited)
+    available.subtract(rows)
+    if min(available.values(), default=0) < 0:
+        return False
+    positions = [columns.index(column) for column in tie_columns]
+    keys = Counter(tuple(row[p] for p in positions) for row in rows)
+    return keys == Counter(tuple(row[p] for p in positions) for row in expected)
+
+
+def verify_against_sql(conn, results):
+    """Compare shared-scan results with the SQL path on conn
+
+    Rows are compared order-insensitively since SQL leaves the order of ties
+    unspecified. Returns (mismatching query numbers, query numbers that only
+    keep different tied rows at a LIMIT). The SQL path picks those rows by
+    whichever index it uses, the shared scan by rowid order.
+    """
+    cursor = conn.cursor()
+    mismatches = []
+    tie_only = []
+    for query_num, (columns, rows) in sorted(results.items()):
+        sql = QUERIES[query_num]["sql"]
+        rows = [tuple(r) for r in rows]
+        expected = [tuple(r) for r in cursor.execute(sql).fetchall()]
+        if Counter(rows) == Counter(expected):
+            continue
+        unlimited = [tuple(r) for r in cursor.execute(_LIMIT_RE.sub("", sql.rstrip())).fetchall()]
+        if _tie_only(columns, rows, expected, unlimited, AGGREGATORS[query_num].tie_columns):
+            tie_only.append(query_num)
+        else:
+            mismatches.append(query_num)
+    return mismatches, tie_only
+
+
+def main():
+    script_dir = Path(__file__).parent
+    db_path = script_dir / "netflix.db"
+    csv_path = script_dir / "netflix_titles.csv"
+
+    args = sys.argv[1:]
+    use_csv = "--csv" in args
+    verify = "--verify" in args
+
+    print("\n" + "="*80)
+    print("NETFLIX SQL PROJECT - SHARED-SCAN EXECUTION")
+    print("="*80 + "\n")
+
+    conn = None
+    if not use_csv or verify:
+        if not db_path.exists():
+            print(f"✗ Database not found: {db_path}")
+            print("Please run: python setup_sqlite.py")
+            sys.exit(1)
+        conn = connect(str(db_path))
+
+    start = time.perf_counter()
+    rows = iter_csv_rows(str(csv_path)) if use_csv else iter_cursor_rows(conn)
+    results = run_shared_scan(rows)
+    elapsed = time.perf_counter() - start
+
+    for query_num, (columns, result_rows) in sorted(results.items()):
+        print(f"Query {query_num}: {QUERIES[query_num]['title']}")
+        print("-" * 80)
+        print("  " + " | ".join(columns))
+        print_results(result_rows)
+
+    print("="*80)
+    print(f"✓ {len(results)} queries answered in one pass ({elapsed:.3f}s)")
+
+    if verify:
+        mismatches, tie_only = verify_against_sql(conn, results)
+        if mismatches:
+            print(f"✗ Results differ from the SQL path for queries: {mismatches}")
+        else:
+            print("✓ Results match the SQL path")
+        if tie_only:
+            print(f"  Queries {tie_only} keep different tied rows at their LIMIT")
+    print("="*80 + "\n")
+
+    if conn:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
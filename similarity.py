@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Netflix SQL Project - "More Like This" Similarity Index
+Builds TF-IDF vectors from descriptions plus one-hot genre, country and
+rating vectors, precomputes each title's top-k neighbours with batched
+sparse matrix products and stores them in the database
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # NumPy and SciPy are optional; only this index needs them
+    np = None
+    sparse = None
+
+from shared_scan import split_multi
+from sql_functions import connect
+
+NEIGHBOR_TABLE = "similar_titles"
+
+# Relative weight of each feature block in the combined cosine similarity
+FEATURE_WEIGHTS = {"description": 1.0, "genres": 0.6, "countries": 0.3, "rating": 0.2}
+
+# Neighbour candidates of a title: titles sharing one of its CANDIDATE_TERMS heaviest
+# description terms, counting only terms at most CANDIDATE_DF titles use, plus up to
+# BUCKET_SIZE titles with the same genres and BUCKET_SIZE with the same genres,
+# countries and rating. This bounds the candidates per title independently of the
+# catalog size; the full feature blocks then score only those pairs.
+CANDIDATE_TERMS = 16
+CANDIDATE_DF = 50
+BUCKET_SIZE = 50
+
+# Upper bound on candidate pairs scored per batch
+BATCH_CELLS = 16_000_000
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+STOPWORDS = frozenset("""
+a about after an and are as at be been before but by for from has have he her him his how in
+into is it its of on one or out over she that the their them they this to two up was were
+when where which while who whose will with
+""".split())
+
+
+def _require_scipy():
+    if sparse is None:
+        raise ImportError("similarity requires NumPy and SciPy: pip install numpy scipy")
+
+
+def tokenize(text):
+    """Lowercase word tokens of a description without stopwords"""
+    return [token for token in _TOKEN_RE.findall((text or "").lower())
+            if len(token) > 1 and token not in STOPWORDS]
+
+
+def _normalize_rows(matrix):
+    """Scale each row of a CSR matrix to unit L2 norm (empty rows stay zero)"""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+def _one_hot(values_per_title):
+    """CSR indicator matrix for a list of value lists"""
+    vocabulary = {}
+    indptr = [0]
+    indices = []
+    for values in values_per_title:
+        for value in set(values):
+            indices.append(vocabulary.setdefault(value, len(vocabulary)))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.float32)
+    return sparse.csr_matrix((data, indices, indptr),
+                             shape=(len(values_per_title), max(len(vocabulary), 1)))
+
+
+def _tfidf(documents):
+    """Sublinear TF-IDF CSR matrix for tokenized documents"""
+    vocabulary = {}
+    indptr = [0]
+    indices = []
+    counts = []
+    for tokens in documents:
+        term_counts = {}
+        for token in tokens:
+            term = vocabulary.setdefault(token, len(vocabulary))
+            term_counts[term] = term_counts.get(term, 0) + 1
+        indices.extend(term_counts)
+        counts.extend(term_counts.values())
+        indptr.append(len(indices))
+
+    tf = sparse.csr_matrix((1.0 + np.log(np.asarray(counts, dtype=np.float32)), indices, indptr),
+                           shape=(len(documents), max(len(vocabulary), 1)))
+    df = np.bincount(np.asarray(indices, dtype=np.int64), minlength=tf.shape[1])
+    idf = (np.log((1.0 + len(documents)) / (1.0 + df)) + 1.0).astype(np.float32)
+    return tf @ sparse.diags(idf)
+
+
+def build_feature_blocks(rows):
+    """{block: weighted, row-normalized CSR matrix} for rows starting with
+    (show_id, description, listed_in, country, rating)
+
+    Side by side the blocks form a unit-norm feature row per title, so the
+    combined cosine similarity is the sum of the per-block products.
+    """
+    _require_scipy()
+    blocks = {
+        "description": _tfidf([tokenize(r[1]) for r in rows]),
+        "genres": _one_hot([split_multi(r[2]) for r in rows]),
+        "countries": _one_hot([split_multi(r[3]) for r in rows]),
+        "rating": _one_hot([[r[4]] if r[4] else [] for r in rows]),
+    }
+    total = sum(FEATURE_WEIGHTS.values())
+    return {name: sparse.csr_matrix(_normalize_rows(blocks[name].tocsr()) * np.sqrt(weight / total),
+                                    dtype=np.float32)
+            for name, weight in FEATURE_WEIGHTS.items()}
+
+
+def build_feature_matrix(rows):
+    """Weighted, row-normalized feature matrix (all blocks stacked) for rows starting with
+    (show_id, description, listed_in, country, rating)"""
+    return sparse.hstack(list(build_feature_blocks(rows).values()), format="csr", dtype=np.float32)
+
+
+def _candidate_terms(description):
+    """(query, postings) CSR matrices whose product pairs titles over shared rare terms
+
+    Postings keep the terms at most CANDIDATE_DF titles use; the query side
+    keeps each title's CANDIDATE_TERMS heaviest of those.
+    """
+    postings = description.tocsr(copy=True)
+    df = np.bincount(postings.indices, minlength=postings.shape[1])
+    postings.data[df[postings.indices] > CANDIDATE_DF] = 0
+    postings.eliminate_zeros()
+
+    query = postings.copy()
+    lengths = np.diff(query.indptr)
+    rows = np.repeat(np.arange(query.shape[0]), lengths)
+    order = np.lexsort((-query.data, rows))
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.arange(len(order)) - query.indptr[rows[order]]
+    query.data[ranks >= CANDIDATE_TERMS] = 0
+    query.eliminate_zeros()
+    return query, postings.T.tocsr()
+
+
+def _candidate_buckets(blocks):
+    """(membership, sample) CSR matrices whose product pairs each title with up to
+    BUCKET_SIZE titles having exactly the same features in every given block"""
+    n = blocks[0].shape[0]
+    buckets = {}
+    for row in range(n):
+        key = tuple(tuple(block.indices[block.indptr[row]:block.indptr[row + 1]]) for block in blocks)
+        buckets.setdefault(key, []).append(row)
+
+    bucket_of = np.empty(n, dtype=np.int64)
+    sample_rows = []
+    sample_columns = []
+    for bucket, members in enumerate(buckets.values()):
+        bucket_of[members] = bucket
+        picked = members[::max(1, len(members) // BUCKET_SIZE)][:BUCKET_SIZE]
+        sample_rows.extend([bucket] * len(picked))
+        sample_columns.extend(picked)
+
+    membership = sparse.csr_matrix((np.ones(n, dtype=np.float32), (np.arange(n), bucket_of)),
+                                   shape=(n, len(buckets)))
+    sample = sparse.csr_matrix((np.ones(len(sample_rows), dtype=np.float32), (sample_rows, sample_columns)),
+                               shape=(len(buckets), n))
+    return membership, sample
+
+
+def top_k_neighbors(blocks, k=10, batch_cells=BATCH_CELLS):
+    """Yield (row, neighbor rows, scores) for every row, best first, in sparse batches
+
+    Each title is only scored against its candidates (see CANDIDATE_TERMS),
+    at most CANDIDATE_TERMS * CANDIDATE_DF + 2 * BUCKET_SIZE of them, so the
+    work grows linearly with the number of titles. Scores are exact cosine
+    similarities over all blocks; a neighbour that shares no rare term and
+    no genre set with the title can be missed. A title with fewer than k
+    candidates gets fewer neighbours.
+    """
+    for block in blocks.values():
+        block.sort_indices()
+    features = sparse.hstack(list(blocks.values()), format="csr")
+    generators = [_candidate_terms(blocks["description"]),
+                  _candidate_buckets([blocks["genres"]]),
+                  _candidate_buckets([blocks["genres"], blocks["countries"], blocks["rating"]])]
+    n = features.shape[0]
+    batch_size = max(1, batch_cells // (CANDIDATE_TERMS * CANDIDATE_DF + 2 * BUCKET_SIZE))
+    k = min(k, n - 1)
+    if k <= 0:
+        return
+
+    for start in range(0, n, batch_size):
+        stop = min(start + batch_size, n)
+        pairs = sum(left[start:stop] @ right for left, right in generators).tocsr()
+        rows = np.repeat(np.arange(start, stop), np.diff(pairs.indptr))
+        keep = pairs.indices != rows  # A title is not its own neighbour
+        rows, columns = rows[keep], pairs.indices[keep]
+        scores = np.asarray(features[rows].multiply(features[columns]).sum(axis=1)).ravel()
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(rows - start, minlength=stop - start))))
+
+        for offset in range(stop - start):
+            low, high = bounds[offset], bounds[offset + 1]
+            row_scores = scores[low:high]
+            best = np.arange(high - low)
+            if len(best) > k:
+                best = np.argpartition(-row_scores, k - 1)[:k]
+            best = best[np.argsort(-row_scores[best], kind="stable")]
+            yield start + offset, columns[low:high][best], row_scores[best]
+
+
+def build_similarity_index(conn, k=10, table="netflix"):
+    """Compute the top-k neighbours of every title and persist them into NEIGHBOR_TABLE"""
+    _require_scipy()
+    rows = conn.execute(
+        f"SELECT show_id, description, listed_in, country, rating, title, type, release_year "
+        f"FROM {table}").fetchall()
+    show_ids = [row[0] for row in rows]
+    blocks = build_feature_blocks(rows)
+
+    cursor = conn.cursor()
+    cursor.execute(f"DROP TABLE IF EXISTS {NEIGHBOR_TABLE}")
+    cursor.execute(f"""
+    CREATE TABLE {NEIGHBOR_TABLE} (
+        show_id TEXT,
+        rank INTEGER,
+        similar_show_id TEXT,
+        title TEXT,
+        type TEXT,
+        release_year INTEGER,
+        score REAL,
+        PRIMARY KEY (show_id, rank)
+    ) WITHOUT ROWID
+    """)
+    # Neighbour details are stored alongside so a lookup is a single primary-key range read
+    insert_sql = f"INSERT INTO {NEIGHBOR_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)"
+
+    batch = []
+    count = 0
+    for row, neighbors, scores in top_k_neighbors(blocks, k):
+        batch.extend((show_ids[row], rank, show_ids[neighbor], *rows[neighbor][5:8], float(score))
+                     for rank, (neighbor, score) in enumerate(zip(neighbors, scores), 1))
+        if len(batch) >= 50_000:
+            cursor.executemany(insert_sql, batch)
+            count += len(batch)
+            batch = []
+    cursor.executemany(insert_sql, batch)
+    count += len(batch)
+    conn.commit()
+    return count
+
+
+def has_similarity_index(conn):
+    cursor = conn.execute("SELECT name FROM sqlite_master WHERE name = ?", (NEIGHBOR_TABLE,))
+    return cursor.fetchone() is not None
+
+
+def similar_titles(conn, show_id, limit=10):
+    """Precomputed neighbours of a title: [(show_id, title, type, release_year, score)]"""
+    cursor = conn.execute(f"""
+    SELECT similar_show_id, title, type, release_year, score
+    FROM {NEIGHBOR_TABLE}
+    WHERE show_id = ?
+    ORDER BY rank
+    LIMIT ?
+    """, (show_id, limit))
+    return [tuple(row) for row in cursor.fetchall()]
+
+
+def main():
+    script_dir = Path(__file__).parent
+    db_path = script_dir / "netflix.db"
+
+    if not db_path.exists():
+        print(f"✗ Database not found: {db_path}")
+        print("Please run: python setup_sqlite.py")
+        sys.exit(1)
+
+    args = sys.argv[1:]
+    k = int(args[args.index("--k") + 1]) if "--k" in args else 10
+
+    conn = connect(str(db_path))
+    start = time.perf_counter()
+    count = build_similarity_index(conn, k)
+    print(f"✓ Stored {count} neighbours in '{NEIGHBOR_TABLE}' ({time.perf_counter() - start:.2f}s)")
+
+    sample = conn.execute("SELECT show_id, title FROM netflix WHERE title = 'Stranger Things'").fetchone()
+    if sample:
+        print(f"\nMore like {sample[1]}:")
+        for show_id, title, type_, year, score in similar_titles(conn, sample[0], 5):
+            print(f"  {score:.3f}  {title} ({type_}, {year})")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Netflix SQL Project - SQL Function Library
+Deterministic SQLite functions for the parsing and classification logic
+the queries used to repeat inline, registered on every project connection
+so setup can build expression indexes on them
+"""
+
+import re
+import sqlite3
+
+# Leading integer of the text before the first space: "90 min" -> 90, "3 Seasons" -> 3
+_DURATION_RE = re.compile(r"([+-]?\d+)?[^ ]* ")
+# Description keywords of query 15; LIKE folds ASCII letters only, hence re.ASCII
+_VIOLENCE_RE = re.compile(r"kill|violence", re.IGNORECASE | re.ASCII)
+_FIRST_GENRE_RE = re.compile(r"[^,]*")
+
+# Expression index name -> indexed expression
+EXPRESSION_INDEXES = {
+    "idx_netflix_duration_value": "duration_value(duration)",
+    "idx_netflix_first_genre": "first_genre(listed_in)",
+    "idx_netflix_content_category": "content_category(description)",
+}
+
+
+def duration_value(duration):
+    """CAST(SUBSTR(duration, 1, INSTR(duration, ' ') - 1) AS INTEGER)"""
+    if duration is None:
+        return None
+    match = _DURATION_RE.match(duration)
+    return int(match.group(1)) if match and match.group(1) else 0
+
+
+def content_category(description):
+    """'Bad' if the description mentions kill or violence (any case), else 'Good'"""
+    if description is not None and _VIOLENCE_RE.search(description):
+        return "Bad"
+    return "Good"
+
+
+def first_genre(listed_in):
+    """TRIM(SUBSTR(listed_in, 0, INSTR(listed_in || ',', ','))): the first listed genre"""
+    if listed_in is None:
+        return None
+    return _FIRST_GENRE_RE.match(listed_in).group(0).strip(" ")
+
+
+FUNCTIONS = {
+    "duration_value": duration_value,
+    "content_category": content_category,
+    "first_genre": first_genre,
+}
+
+
+def register_functions(conn):
+    """Register FUNCTIONS on a connection (needed before touching indexed tables)"""
+    for name, function in FUNCTIONS.items():
+        conn.create_function(name, 1, function, deterministic=True)
+    return conn
+
+
+def connect(database, **kwargs):
+    """sqlite3.connect() with the project's SQL functions registered"""
+    return register_functions(sqlite3.connect(database, **kwargs))
+
+
+def create_expression_indexes(conn):
+    """Index the computed values so the planner can seek and group on them
+
+    In the compact layout netflix is a view, so the indexes go on the
+    netflix_data table underneath it.
+    """
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = 'netflix'").fetchone()
+    table = "netflix_data" if row and row[0] == "view" else "netflix"
+    for name, expression in EXPRESSION_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({expression})")
+    conn.commit()
+    return table
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Netflix SQL Project - date_added Time Index
+Cumulative per-day counts of added titles, broken down by type, country and
+genre, so range counts and trend series come from prefix sums instead of scans
+"""
+
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+from shared_scan import split_multi
+from sql_functions import connect
+
+INDEX_TABLE = "date_added_index"
+# Number of netflix rows the persisted index covers, checked by TimeIndex.load()
+INDEX_META = "date_added_index_meta"
+
+# (dimension, value) of the series counting every title
+ALL = ("all", "")
+
+
+def parse_date_added(value):
+    """Parse a date_added value such as 'September 25, 2021' (None if empty or malformed)"""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value.strip(), "%B %d, %Y").date()
+    except ValueError:
+        return None
+
+
+def day_key(day):
+    return day.toordinal()
+
+
+def month_key(day):
+    return day.year * 12 + day.month - 1
+
+
+def month_label(key):
+    return f"{key // 12:04d}-{key % 12 + 1:02d}"
+
+
+class PrefixSeries:
+    """Per-day counts over a contiguous key range kept as a Fenwick (binary indexed) tree
+
+    prefix() and add() are O(log n); the range grows by doubling when a
+    title arrives outside it.
+    """
+
+    def __init__(self, base, size=64):
+        self.base = base
+        self.counts = [0] * size
+        self.tree = [0] * (size + 1)
+        self.total = 0
+
+    def _rebuild(self, base, size):
+        old_base, old_counts = self.base, self.counts
+        self.base = base
+        self.counts = [0] * size
+        self.tree = [0] * (size + 1)
+        self.total = 0
+        for offset, count in enumerate(old_counts):
+            if count:
+                self.add(old_base + offset, count)
+
+    def add(self, key, delta=1):
+        if key < self.base or key >= self.base + len(self.counts):
+            used = self.items()
+            low = min(key, used[0][0]) if used else key
+            high = max(key, used[-1][0]) if used else key
+            size = len(self.counts)
+            while size < high - low + 1:
+                size *= 2
+            # Leave the spare capacity on the side the range is growing towards
+            self._rebuild(low if key >= self.base else high - size + 1, size)
+
+        position = key - self.base
+        self.counts[position] += delta
+        self.total += delta
+        i = position + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, key):
+        """Number of titles with key <= the given key"""
+        if key < self.base:
+            return 0
+        i = min(key - self.base + 1, len(self.counts))
+        result = 0
+        while i > 0:
+            result += self.tree[i]
+            i -= i & -i
+        return result
+
+    def range(self, start_key, end_key):
+        """Number of titles with start_key <= key <= end_key"""
+        if end_key < start_key:
+            return 0
+        return self.prefix(end_key) - self.prefix(start_key - 1)
+
+    def items(self):
+        """Non-zero (key, count) pairs in key order"""
+        return [(self.base + offset, count)
+                for offset, count in enumerate(self.counts) if count]
+
+
+class TimeIndex:
+    """Prefix-sum counts of titles by date_added for every (dimension, value)
+
+    Dimensions are 'all', 'type', 'country' and 'genre'; a title with several
+    countries or genres is counted once in each of them.
+    """
+
+    def __init__(self):
+        self.series = {}
+        # Titles indexed so far, undated ones included, to compare with COUNT(*)
+        self.titles = 0
+
+    @staticmethod
+    def _dimensions(type_, country, listed_in):
+        dimensions = [ALL, ("type", type_ or "")]
+        dimensions += [("country", c) for c in split_multi(country)]
+        dimensions += [("genre", g) for g in split_multi(listed_in)]
+        return dimensions
+
+    def add_title(self, date_added, type_, country, listed_in, delta=1):
+        """Incrementally index one title (delta=-1 removes it); returns False if undated"""
+        self.titles += delta
+        day = date_added if isinstance(date_added, date) else parse_date_added(date_added)
+        if day is None:
+            return False
+        key = day_key(day)
+
+        for dimension in self._dimensions(type_, country, listed_in):
+            series = self.series.get(dimension)
+            if series is None:
+                series = self.series[dimension] = PrefixSeries(key)
+            series.add(key, delta)
+        return True
+
+    @classmethod
+    def from_connection(cls, conn, table="netflix"):
+        """Build the index from the date_added, type, country and listed_in columns"""
+        index = cls()
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT date_added, type, country, listed_in FROM {table}")
+        for date_added, type_, country, listed_in in cursor:
+            index.add_title(date_added, type_, country, listed_in)
+        return index
+
+    def count(self, start, end, dimension="all", value=""):
+        """Titles added between the start and end dates (inclusive)"""
+        series = self.series.get((dimension, value))
+        if series is None:
+            return 0
+        return series.range(day_key(start), day_key(end))
+
+    def breakdown(self, start, end, dimension):
+        """{value: count} of titles added between start and end for every value of a dimension"""
+        start_key, end_key = day_key(start), day_key(end)
+        counts = {}
+        for (name, value), series in self.series.items():
+            if name == dimension:
+                count = series.range(start_key, end_key)
+                if count:
+                    counts[value] = count
+        return counts
+
+    def trend(self, start, end, dimension="all", value="", by="month"):
+        """[(label, count)] per month (or per year with by='year') between start and end"""
+        series = self.series.get((dimension, value))
+        if by == "year":
+            buckets = [(str(year), date(year, 1, 1), date(year, 12, 31))
+                       for year in range(start.year, end.year + 1)]
+        else:
+            buckets = []
+            for key in range(month_key(start), month_key(end) + 1):
+                year, month = divmod(key, 12)
+                first = date(year, month + 1, 1)
+                last = date(year + (month == 11), (month + 1) % 12 + 1, 1).toordinal() - 1
+                buckets.append((month_label(key), first, date.fromordinal(last)))
+
+        result = []
+        for label, first, last in buckets:
+            first, last = max(first, start), min(last, end)
+            count = series.range(day_key(first), day_key(last)) if series else 0
+            result.append((label, count))
+        return result
+
+    def latest(self):
+        """Most recent date_added in the index"""
+        series = self.series.get(ALL)
+        if series is None or not series.total:
+            return None
+        return date.fromordinal(series.items()[-1][0])
+
+    def save(self, conn):
+        """Persist the per-day counts and cumulative counts into INDEX_TABLE"""
+        cursor = conn.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {INDEX_TABLE}")
+        cursor.execute(f"""
+        CREATE TABLE {INDEX_TABLE} (
+            dimension TEXT,
+            value TEXT,
+            day INTEGER,
+            count INTEGER,
+            cumulative INTEGER,
+            PRIMARY KEY (dimension, value, day)
+        ) WITHOUT ROWID
+        """)
+        rows = []
+        for (dimension, value), series in self.series.items():
+            cumulative = 0
+            for key, count in series.items():
+                cumulative += count
+                rows.append((dimension, value, key, count, cumulative))
+        cursor.executemany(f"INSERT INTO {INDEX_TABLE} VALUES (?, ?, ?, ?, ?)", rows)
+        cursor.execute(f"DROP TABLE IF EXISTS {INDEX_META}")
+        cursor.execute(f"CREATE TABLE {INDEX_META} (name TEXT PRIMARY KEY, value INTEGER)")
+        cursor.execute(f"INSERT INTO {INDEX_META} VALUES ('titles', ?)", (self.titles,))
+        conn.commit()
+        return len(rows)
+
+    def save_titles(self, conn, titles, delta=1):
+        """Index (date_added, type, country, listed_in) titles and persist only what changed
+
+        Call it alongside the INSERT (or DELETE, with delta=-1) of the same
+        titles in netflix. Only the affected series are rewritten, from the
+        earliest changed day onwards, since their later cumulative counts
+        shift. Falls back to save() if nothing has been persisted yet.
+        Returns the number of rows written.
+        """
+        changed = {}
+        for date_added, type_, country, listed_in in titles:
+            day = date_added if isinstance(date_added, date) else parse_date_added(date_added)
+            self.add_title(day, type_, country, listed_in, delta)
+            if day is None:
+                continue
+            key = day_key(day)
+            for dimension in self._dimensions(type_, country, listed_in):
+                changed[dimension] = min(key, changed.get(dimension, key))
+
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE name = ?", (INDEX_META,))
+        if cursor.fetchone() is None:
+            return self.save(conn)
+
+        rows = []
+        for (dimension, value), first in changed.items():
+            cursor.execute(f"DELETE FROM {INDEX_TABLE} WHERE dimension = ? AND value = ? AND day >= ?",
+                           (dimension, value, first))
+            series = self.series[(dimension, value)]
+            cumulative = series.prefix(first - 1)
+            for key, count in series.items():
+                if key >= first:
+                    cumulative += count
+                    rows.append((dimension, value, key, count, cumulative))
+        cursor.executemany(f"INSERT INTO {INDEX_TABLE} VALUES (?, ?, ?, ?, ?)", rows)
+        cursor.execute(f"UPDATE {INDEX_META} SET value = ? WHERE name = 'titles'", (self.titles,))
+        conn.commit()
+        return len(rows)
+
+    @classmethod
+    def load(cls, conn, table="netflix"):
+        """Load a persisted index, or None if it is missing or does not cover every row of table
+
+        A title count that differs from COUNT(*) means rows were added or
+        removed without save_titles(), so the caller should rebuild.
+        """
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE name = ?", (INDEX_TABLE,))
+        if cursor.fetchone() is None:
+            return None
+        cursor.execute("SELECT name FROM sqlite_master WHERE name = ?", (INDEX_META,))
+        if cursor.fetchone() is None:
+            return None
+        cursor.execute(f"SELECT value FROM {INDEX_META} WHERE name = 'titles'")
+        stored = cursor.fetchone()
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        if stored is None or stored[0] != cursor.fetchone()[0]:
+            return None
+        index = cls()
+        index.titles = stored[0]
+        cursor.execute(f"SELECT dimension, value, day, count FROM {INDEX_TABLE} ORDER BY dimension, value, day")
+        for dimension, value, key, count in cursor:
+            series = index.series.get((dimension, value))
+            if series is None:
+                series = index.series[(dimension, value)] = PrefixSeries(key)
+            series.add(key, count)
+        return index
+
+
+def years_back(day, years):
+    """The same calendar day the given number of years earlier (Feb 29 -> Feb 28)"""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+def main():
+    script_dir = Path(__file__).parent
+    db_path = script_dir / "netflix.db"
+
+    if not db_path.exists():
+        print(f"✗ Database not found: {db_path}")
+        print("Please run: python setup_sqlite.py")
+        sys.exit(1)
+
+    conn = connect(str(db_path))
+    start = time.perf_counter()
+    index = TimeIndex.load(conn)
+    if index is None:
+        index = TimeIndex.from_connection(conn)
+        if "--save" in sys.argv[1:]:
+            rows = index.save(conn)
+            print(f"✓ Saved {rows} rows into {INDEX_TABLE}")
+    conn.close()
+    print(f"✓ Time index ready: {len(index.series)} series in {time.perf_counter() - start:.2f}s\n")
+
+    end = index.latest()
+    if end is None:
+        print("✗ No dated titles found")
+        return
+    begin = years_back(end, 5)
+
+    start = time.perf_counter()
+    total = index.count(begin, end)
+    by_type = index.breakdown(begin, end, "type")
+    elapsed = time.perf_counter() - start
+    print(f"Titles added {begin} .. {end}: {total} ({elapsed * 1000:.3f} ms)")
+    for type_, count in sorted(by_type.items(), key=lambda item: -item[1]):
+        print(f"  {type_:<10} {count}")
+
+    print("\nTitles added per year:")
+    for label, count in index.trend(begin, end, by="year"):
+        print(f"  {label}  {count}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Netflix SQL Project - Compact Title Records
+Loads the catalog into __slots__ Title records with interned strings and
+reports the memory cost per title against the plain csv/sqlite3 rows
+"""
+
+import csv
+import sqlite3
+import sys
+from pathlib import Path
+
+from shared_scan import iter_csv_rows, iter_cursor_rows, split_multi
+from sql_functions import connect
+
+
+class Title:
+    """One catalog entry; multi-valued fields are tuples of interned names"""
+
+    __slots__ = ("show_id", "type", "title", "directors", "casts", "countries",
+                 "date_added", "release_year", "rating", "duration", "genres", "description")
+
+    def __init__(self, show_id, type, title, directors, casts, countries,
+                 date_added, release_year, rating, duration, genres, description):
+        self.show_id = show_id
+        self.type = type
+        self.title = title
+        self.directors = directors
+        self.casts = casts
+        self.countries = countries
+        self.date_added = date_added
+        self.release_year = release_year
+        self.rating = rating
+        self.duration = duration
+        self.genres = genres
+        self.description = description
+
+    def __repr__(self):
+        return f"Title({self.show_id!r}, {self.title!r}, {self.type!r}, {self.release_year!r})"
+
+
+class Interner:
+    """Shares one string object (and one tuple object) per distinct value"""
+
+    def __init__(self):
+        self.strings = {}
+        self.tuples = {}
+
+    def __call__(self, value):
+        if value is None:
+            return None
+        return self.strings.setdefault(value, value)
+
+    def names(self, value):
+        names = tuple(self(name) for name in split_multi(value))
+        return self.tuples.setdefault(names, names)
+
+
+def make_title(row, intern):
+    """Build a Title from a row tuple in shared_scan.COLUMNS order"""
+    (show_id, type_, title, director, casts, country,
+     date_added, release_year, rating, duration, listed_in, description) = row
+    return Title(show_id, intern(type_), title, intern.names(director), intern.names(casts),
+                 intern.names(country), intern(date_added), release_year, intern(rating),
+                 intern(duration), intern.names(listed_in), description)
+
+
+def load_titles(rows):
+    """Load Title records from shared_scan row tuples (iter_csv_rows / iter_cursor_rows)"""
+    intern = Interner()
+    return [make_title(row, intern) for row in rows]
+
+
+def deep_size(obj, seen=None):
+    """Approximate bytes held by obj, counting each shared object once"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float)) or obj is None:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset, sqlite3.Row)):
+        return size + sum(deep_size(item, seen) for item in obj)
+    if hasattr(obj, "__slots__"):
+        return size + sum(deep_size(getattr(obj, slot), seen) for slot in obj.__slots__)
+    return size
+
+
+def memory_report(csv_path, db_path=None):
+    """Bytes per title for csv.reader lists, sqlite3.Row objects and Title records"""
+    report = {}
+
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        csv_reader = csv.reader(f)
+        next(csv_reader)
+        rows = list(csv_reader)
+    report["csv.reader lists"] = (deep_size(rows), len(rows))
+
+    if db_path is not None:
+        conn = connect(db_path)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute("SELECT * FROM netflix").fetchall()
+        report["sqlite3.Row"] = (deep_size(rows), len(rows))
+        conn.row_factory = None
+        titles = load_titles(iter_cursor_rows(conn))
+        conn.close()
+    else:
+        titles = load_titles(iter_csv_rows(csv_path))
+    report["Title records"] = (deep_size(titles), len(titles))
+
+    return report
+
+
+def main():
+    script_dir = Path(__file__).parent
+    db_path = script_dir / "netflix.db"
+    csv_path = script_dir / "netflix_titles.csv"
+
+    print("\n" + "="*60)
+    print("Netflix SQL Project - Title Record Memory Report")
+    print("="*60 + "\n")
+
+    report = memory_report(str(csv_path), str(db_path) if db_path.exists() else None)
+    baseline = max(total / count for total, count in report.values() if count)
+    for name, (total, count) in report.items():
+        per_title = total / count if count else 0
+        print(f"{name:<20} {total / 1024 / 1024:8.2f} MB  {per_title:8.0f} bytes/title"
+              f"  ({100.0 * per_title / baseline:.0f}%)")
+    print()
+
+
+if __name__ == "__main__":
+    main()